@@ -1,29 +1,61 @@
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Tuple, Union
+import httpx
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import arxiv
 import time
 import os
 import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 import json
 import argparse
+import re
 import io
+import gzip
+import hashlib
+import itertools
+import queue
+import threading
+import sqlite3
+import tempfile
 import uuid
-from urllib.parse import quote
+import types
+import random
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlparse
 from zoneinfo import ZoneInfo
 
-# set up clients for arXiv, GenAI, and Discord
-client_arxiv = arxiv.Client()
+# set up the GenAI client (arXiv clients are created per category query)
 client_genai = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 
 STATE_FILE_PATH = os.getenv("PENDING_JOBS_FILE", "state/pending_jobs.json")
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "state/pending_jobs.sqlite3")
+STATE_JOURNAL_PATH = os.getenv("STATE_JOURNAL_FILE", "state/pending_jobs.journal.jsonl")
+STATE_DELTA_DIR = os.getenv("STATE_DELTA_DIR", "state/deltas")
+PAPER_STORE_DIR = os.getenv("PAPER_STORE_DIR", "state/papers")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_FILE", "state/result_cache.json")
+STATE_FORMAT = os.getenv("STATE_FORMAT", "segmented").strip().lower() or "segmented"
+STATE_BACKEND = os.getenv("STATE_BACKEND", "json").strip().lower() or "json"
 STATE_SCHEMA_VERSION = 1
 INTEREST_MODEL = os.getenv("INTEREST_MODEL", "gemini-3.5-flash-lite")
+# optional stronger model that re-checks the verdicts INTEREST_MODEL is unsure about
+INTEREST_ESCALATION_MODEL = os.getenv("INTEREST_ESCALATION_MODEL", "")
 SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gemini-3.6-flash")
 READING_MODEL = os.getenv("READING_MODEL", SUMMARY_MODEL)
 DISCORD_API_BASE_URL = "https://discord.com/api/v10"
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
 READ_EMOJI = "📖"
+# numbered reactions that request the reading memo of the paper in that slot of a digest message
+KEYCAP_EMOJIS = tuple(f"{number}\ufe0f\u20e3" for number in range(1, 10)) + ("🔟",)
 MAX_PDF_BYTES = 50 * 1024 * 1024
 COMPLETED_BATCH_STATUS = (
     "JOB_STATE_SUCCEEDED",
@@ -31,6 +63,25 @@ COMPLETED_BATCH_STATUS = (
     "JOB_STATE_CANCELLED",
     "JOB_STATE_EXPIRED",
 )
+INTEREST_ACTIVE_STATUSES = ("interest_submitted", "interest_running", "interest_fallback_running")
+SUMMARY_ACTIVE_STATUSES = (
+    "fused_submitted",
+    "fused_running",
+    "summarize_submitted",
+    "summarize_running",
+    "summary_fallback_running",
+    "send_failed",
+)
+BATCH_WAITING_STATUSES = (
+    "interest_submitted",
+    "interest_running",
+    "fused_submitted",
+    "fused_running",
+    "summarize_submitted",
+    "summarize_running",
+)
+FINALIZED_STATUSES = ("completed", "completed_no_interests")
+STATE_ARCHIVE_DIR = os.getenv("STATE_ARCHIVE_DIR", "state/archive")
 
 try:
     BATCH_TIMEOUT_HOURS = int(os.getenv("BATCH_TIMEOUT_HOURS", "48"))
@@ -46,13 +97,109 @@ def read_positive_number_env(name: str, default: float) -> float:
     return value if value > 0 else default
 
 
+def read_positive_int_env(name: str, default: int) -> int:
+    return max(1, int(read_positive_number_env(name, default)))
+
+
 DISCORD_CONNECT_TIMEOUT_SECONDS = read_positive_number_env("DISCORD_CONNECT_TIMEOUT_SECONDS", 5.0)
 DISCORD_READ_TIMEOUT_SECONDS = read_positive_number_env("DISCORD_READ_TIMEOUT_SECONDS", 15.0)
 DISCORD_RETRY_BACKOFF_SECONDS = read_positive_number_env("DISCORD_RETRY_BACKOFF_SECONDS", 1.0)
+# reaction PUTs run in parallel with the webhook posts; the rate limiter keeps each bucket within its limit
+DISCORD_CONCURRENCY = read_positive_int_env("DISCORD_CONCURRENCY", 4)
+# "single": one webhook message and a 📖 reaction per paper;
+# "digest": up to DISCORD_DIGEST_SIZE embeds per message, requested with numbered reactions
+DISCORD_SEND_MODE = os.getenv("DISCORD_SEND_MODE", "single")
+DISCORD_DIGEST_SIZE = min(len(KEYCAP_EMOJIS), read_positive_int_env("DISCORD_DIGEST_SIZE", 10))
+DISCORD_MAX_RATE_LIMIT_WAIT_SECONDS = 60.0
+# one pooled keep-alive session per host; connection errors, and read errors of idempotent
+# methods, are retried
+HTTP_POOL_MAXSIZE = read_positive_int_env("HTTP_POOL_MAXSIZE", 10)
+HTTP_RETRY_TOTAL = read_positive_int_env("HTTP_RETRY_TOTAL", 2)
+HTTP_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
 try:
     DISCORD_MAX_ATTEMPTS = max(1, int(os.getenv("DISCORD_MAX_ATTEMPTS", "3")))
 except ValueError:
     DISCORD_MAX_ATTEMPTS = 3
+READING_REQUEST_WINDOW_DAYS = read_positive_number_env("READING_REQUEST_WINDOW_DAYS", 14.0)
+# reactions of a message are checked less often as it ages: (below this age in days, every N minutes)
+READING_CHECK_SCHEDULE = ((1.0, 10.0), (7.0, 60.0), (math.inf, 1440.0))
+# messages older than this are not checked any more
+READING_CHECK_HORIZON_DAYS = read_positive_number_env(
+    "READING_CHECK_HORIZON_DAYS", READING_REQUEST_WINDOW_DAYS
+)
+READING_CHECK_NEVER = "9999-12-31T00:00:00+00:00"
+# checks due this soon run now, so a 10 minute check is not pushed back by a slightly early run
+READING_CHECK_SLACK_MINUTES = 2.0
+DISCORD_EPOCH_MS = 1420070400000
+STATE_DELTA_FOLD_BYTES = read_positive_number_env("STATE_DELTA_FOLD_BYTES", 256 * 1024)
+RESULT_CACHE_MAX_ENTRIES = read_positive_int_env("RESULT_CACHE_MAX_ENTRIES", 5000)
+RESULT_CACHE_TTL_DAYS = read_positive_number_env("RESULT_CACHE_TTL_DAYS", 30.0)
+HARVEST_LAG_DAYS = read_positive_int_env("HARVEST_LAG_DAYS", 3)
+HARVEST_WINDOW_HOURS = read_positive_number_env("HARVEST_WINDOW_HOURS", 24.0)
+HARVEST_MAX_WINDOWS = read_positive_int_env("HARVEST_MAX_WINDOWS", 7)
+BACKFILL_CHUNK_SIZE = read_positive_int_env("BACKFILL_CHUNK_SIZE", 500)
+BACKFILL_MAX_ACTIVE_BATCHES = read_positive_int_env("BACKFILL_MAX_ACTIVE_BATCHES", 3)
+ARXIV_CATEGORIES = [
+    category.strip()
+    for category in (os.getenv("ARXIV_CATEGORIES") or "math.DS,math.CO,math.GR,cs.LO,cs.FL,cs.DM").split(",")
+    if category.strip()
+]
+ARXIV_CATEGORY_GROUP_SIZE = read_positive_int_env("ARXIV_CATEGORY_GROUP_SIZE", 1)
+ARXIV_FETCH_CONCURRENCY = read_positive_int_env("ARXIV_FETCH_CONCURRENCY", 3)
+# arXiv's terms of use ask for at most one request every three seconds
+ARXIV_REQUEST_INTERVAL_SECONDS = read_positive_number_env("ARXIV_REQUEST_INTERVAL_SECONDS", 3.0)
+ARXIV_TIMEZONE = ZoneInfo("America/New_York")
+ARXIV_PAGE_SIZE = read_positive_int_env("ARXIV_PAGE_SIZE", 100)
+ARXIV_MAX_ATTEMPTS = read_positive_int_env("ARXIV_MAX_ATTEMPTS", 4)
+GEMINI_CONCURRENCY = read_positive_int_env("GEMINI_CONCURRENCY", 4)
+GEMINI_RPM = read_positive_number_env("GEMINI_RPM", 60.0)
+GEMINI_TPM = read_positive_number_env("GEMINI_TPM", 1_000_000.0)
+GEMINI_MAX_ATTEMPTS = read_positive_int_env("GEMINI_MAX_ATTEMPTS", 5)
+GEMINI_RETRY_BACKOFF_SECONDS = read_positive_number_env("GEMINI_RETRY_BACKOFF_SECONDS", 2.0)
+GEMINI_RETRY_MAX_BACKOFF_SECONDS = 60.0
+# failed batch items are resubmitted as a smaller batch; below this count they are retried individually
+BATCH_RETRY_MIN_ITEMS = read_positive_int_env("BATCH_RETRY_MIN_ITEMS", 10)
+BATCH_RETRY_MAX_ROUNDS = read_positive_int_env("BATCH_RETRY_MAX_ROUNDS", 2)
+# batches with at least this many requests are uploaded as a JSONL file instead of being sent inline
+# running batches are polled again after half of their predicted remaining time, within these bounds
+BATCH_POLL_MIN_MINUTES = read_positive_number_env("BATCH_POLL_MIN_MINUTES", 20.0)
+BATCH_POLL_MAX_MINUTES = read_positive_number_env("BATCH_POLL_MAX_MINUTES", 360.0)
+BATCH_DURATION_HISTORY = read_positive_int_env("BATCH_DURATION_HISTORY", 50)
+# fixed overhead of a batch, counted in items, when scaling past durations to another batch size
+BATCH_DURATION_ITEM_OFFSET = 50
+POLL_SCHEDULE_PATH = os.getenv("POLL_SCHEDULE_PATH", "state/poll_schedule.json")
+POLL_FORCE = os.getenv("POLL_FORCE", "").lower() == "true"
+# number of papers judged in a single interest request; 1 keeps one request per paper
+INTEREST_PACK_SIZE = read_positive_int_env("INTEREST_PACK_SIZE", 1)
+GEMINI_RETRYABLE_CODES = (429, 500, 502, 503, 504)
+# "implicit": fixed instructions go first as a system instruction so the provider can reuse the prefix;
+# "explicit": additionally create a cached context per model for direct (non-batch) requests
+GEMINI_PROMPT_CACHE = os.getenv("GEMINI_PROMPT_CACHE", "implicit")
+GEMINI_PROMPT_CACHE_TTL_HOURS = read_positive_number_env("GEMINI_PROMPT_CACHE_TTL_HOURS", 6.0)
+# local scorer run before the interest model: "off", "log" (score only) or "apply" (skip decided papers)
+PREFILTER_MODE = os.getenv("PREFILTER_MODE", "off")
+PREFILTER_REJECT_BELOW = read_positive_number_env("PREFILTER_REJECT_BELOW", 0.02)
+# cosine similarity never exceeds 1, so the default never accepts without the model
+PREFILTER_ACCEPT_ABOVE = read_positive_number_env("PREFILTER_ACCEPT_ABOVE", 1.01)
+PREFILTER_PROFILE_PATH = os.getenv("PREFILTER_PROFILE_FILE", "state/interest_profile.json")
+PREFILTER_PROFILE_MAX_POSITIVES = read_positive_int_env("PREFILTER_PROFILE_MAX_POSITIVES", 300)
+PREFILTER_PROFILE_TERMS_PER_PAPER = 40
+# "llm" asks INTEREST_MODEL; "embedding" ranks papers by similarity to past 📖 requests
+INTEREST_ENGINE = os.getenv("INTEREST_ENGINE", "llm")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "gemini-embedding-001")
+EMBEDDING_DIMENSIONS = read_positive_int_env("EMBEDDING_DIMENSIONS", 768)
+EMBEDDING_INDEX_PATH = os.getenv("EMBEDDING_INDEX_FILE", "state/embedding_index.npz")
+EMBEDDING_NEIGHBORS = read_positive_int_env("EMBEDDING_NEIGHBORS", 3)
+EMBEDDING_MIN_SIMILARITY = read_positive_number_env("EMBEDDING_MIN_SIMILARITY", 0.7)
+EMBEDDING_BATCH_SIZE = 100
+EMBEDDING_DELTA_FOLD_ROWS = read_positive_int_env("EMBEDDING_DELTA_FOLD_ROWS", 500)
+INTEREST_ESCALATION_THRESHOLD = read_positive_number_env("INTEREST_ESCALATION_THRESHOLD", 0.7)
+# "auto" judges and summarizes small pipelines in one SUMMARY_MODEL batch; "off" always uses two batches
+INTEREST_FUSED_MODE = os.getenv("INTEREST_FUSED_MODE", "auto")
+INTEREST_FUSED_MAX_PAPERS = read_positive_int_env("INTEREST_FUSED_MAX_PAPERS", 20)
+# rough budget for a prompt without a known length (reading memos send the whole PDF)
+GEMINI_OUTPUT_TOKEN_ESTIMATE = 1024
+GEMINI_PDF_TOKEN_ESTIMATE = 40_000
 
 DISCORD_CONTENT_LIMIT = 2000
 DISCORD_EMBED_TITLE_LIMIT = 256
@@ -65,6 +212,8 @@ DISCORD_EMBED_TOTAL_LIMIT = 6000
 
 class InterestCheck(BaseModel):
     interested_in: bool = Field(..., description="興味がありそうな内容かどうか")
+    # answers to batches submitted before confidences were asked for count as confident
+    confidence: float = Field(1.0, ge=0, le=1, description="判定の確信度（0〜1）")
 
 
 class Summary(BaseModel):
@@ -74,6 +223,22 @@ class Summary(BaseModel):
     appendix: Optional[str] = Field(None, description="補足情報")
 
 
+class PackedInterestCheck(BaseModel):
+    paper_id: str = Field(..., description="見出しに書かれた論文の paper_id")
+    interested_in: bool = Field(..., description="興味がありそうな内容かどうか")
+    confidence: float = Field(1.0, ge=0, le=1, description="判定の確信度（0〜1）")
+
+
+class PackedInterestChecks(BaseModel):
+    results: List[PackedInterestCheck] = Field(..., description="論文ごとの判定結果")
+
+
+class FusedCheck(BaseModel):
+    interested_in: bool = Field(..., description="興味がありそうな内容かどうか")
+    confidence: float = Field(1.0, ge=0, le=1, description="判定の確信度（0〜1）")
+    summary: Optional[Summary] = Field(None, description="興味がある場合のみの論文の要約")
+
+
 class ReadingMemo(BaseModel):
     conclusion: str = Field(..., description="30秒で分かる結論")
     main_claims: str = Field(..., description="主定理・主張")
@@ -89,6 +254,14 @@ prompt_check_interest = ""
 with open("src/prompt_check_interest.txt", "r", encoding="utf-8") as f:
     prompt_check_interest = f.read()
 
+prompt_check_interest_packed = ""
+with open("src/prompt_check_interest_packed.txt", "r", encoding="utf-8") as f:
+    prompt_check_interest_packed = f.read()
+
+prompt_check_interest_and_summarize = ""
+with open("src/prompt_check_interest_and_summarize.txt", "r", encoding="utf-8") as f:
+    prompt_check_interest_and_summarize = f.read()
+
 prompt_summarize = ""
 with open("src/prompt_summarize.txt", "r", encoding="utf-8") as f:
     prompt_summarize = f.read()
@@ -126,49 +299,1112 @@ def mark_job_updated(job: dict) -> None:
     job["updated_at"] = now_iso_utc()
 
 
+def empty_state() -> dict:
+    return {"schema_version": STATE_SCHEMA_VERSION, "jobs": []}
+
+
+def normalize_state(state: object) -> dict:
+    if not isinstance(state, dict):
+        return empty_state()
+    if "schema_version" not in state:
+        state["schema_version"] = STATE_SCHEMA_VERSION
+    if "jobs" not in state or not isinstance(state["jobs"], list):
+        state["jobs"] = []
+    return state
+
+
 def ensure_state_file() -> None:
     parent_dir = os.path.dirname(STATE_FILE_PATH)
     if parent_dir:
         os.makedirs(parent_dir, exist_ok=True)
     if not os.path.exists(STATE_FILE_PATH):
         with open(STATE_FILE_PATH, "w", encoding="utf-8") as f:
-            json.dump({"schema_version": STATE_SCHEMA_VERSION, "jobs": []}, f, ensure_ascii=False, indent=2)
+            json.dump(empty_state(), f, ensure_ascii=False, indent=2)
 
 
-def load_state() -> dict:
-    ensure_state_file()
-    with open(STATE_FILE_PATH, "r", encoding="utf-8") as f:
-        state = json.load(f)
+def read_state_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return normalize_state(json.load(f))
 
-    if not isinstance(state, dict):
-        return {"schema_version": STATE_SCHEMA_VERSION, "jobs": []}
-    if "schema_version" not in state:
-        state["schema_version"] = STATE_SCHEMA_VERSION
-    if "jobs" not in state or not isinstance(state["jobs"], list):
+
+def write_state_json(state: dict, path: str) -> None:
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def dump_compact_json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def list_state_deltas() -> List[str]:
+    if not os.path.isdir(STATE_DELTA_DIR):
+        return []
+    names = sorted(name for name in os.listdir(STATE_DELTA_DIR) if name.endswith(".json"))
+    return [os.path.join(STATE_DELTA_DIR, name) for name in names]
+
+
+def apply_state_delta(state: dict, delta: dict) -> None:
+    for key, value in delta.get("meta", {}).items():
+        state[key] = value
+    deleted = set(delta.get("deleted_jobs", []))
+    if deleted:
+        state["jobs"] = [job for job in state["jobs"] if job.get("pipeline_id") not in deleted]
+    jobs_by_id = {job.get("pipeline_id"): job for job in state["jobs"]}
+    for pipeline_id, change in delta.get("jobs", {}).items():
+        job = jobs_by_id.get(pipeline_id)
+        if job is None:
+            job = {"pipeline_id": pipeline_id}
+            state["jobs"].append(job)
+            jobs_by_id[pipeline_id] = job
+        job.update(change.get("set", {}))
+        for key in change.get("unset", []):
+            job.pop(key, None)
+
+
+def state_fingerprint(state: dict) -> dict:
+    return {
+        "meta": {key: dump_compact_json(value) for key, value in state.items() if key != "jobs"},
+        "jobs": {
+            job.get("pipeline_id"): {key: dump_compact_json(value) for key, value in job.items()}
+            for job in state["jobs"]
+        },
+    }
+
+
+def build_state_delta(baseline: dict, state: dict) -> dict:
+    current = state_fingerprint(state)
+    delta: dict = {}
+    meta = {
+        key: state[key]
+        for key, value in current["meta"].items()
+        if baseline["meta"].get(key) != value
+    }
+    if meta:
+        delta["meta"] = meta
+
+    jobs_by_id = {job.get("pipeline_id"): job for job in state["jobs"]}
+    job_changes = {}
+    for pipeline_id, fields in current["jobs"].items():
+        previous = baseline["jobs"].get(pipeline_id, {})
+        changed = {
+            key: jobs_by_id[pipeline_id][key]
+            for key, value in fields.items()
+            if previous.get(key) != value
+        }
+        removed = [key for key in previous if key not in fields]
+        if changed or removed:
+            job_changes[pipeline_id] = {"set": changed}
+            if removed:
+                job_changes[pipeline_id]["unset"] = removed
+    if job_changes:
+        delta["jobs"] = job_changes
+
+    deleted = [pipeline_id for pipeline_id in baseline["jobs"] if pipeline_id not in current["jobs"]]
+    if deleted:
+        delta["deleted_jobs"] = deleted
+    return delta
+
+
+class JsonStateBackend:
+    """JSON state in `STATE_FILE_PATH`; filters are ignored and every job is loaded.
+
+    With `STATE_FORMAT=segmented` the file is an immutable snapshot and each
+    save only writes the changed job fields to a new file in
+    `STATE_DELTA_DIR`.  Once the deltas exceed `STATE_DELTA_FOLD_BYTES` they
+    are folded into a fresh snapshot.
+    """
+
+    def __init__(self, segmented: bool):
+        self.segmented = segmented
+        self.baseline = {"meta": {}, "jobs": {}}
+
+    def load(self, statuses: Optional[Tuple[str, ...]] = None, open_messages_only: bool = False) -> dict:
+        ensure_state_file()
+        state = read_state_json(STATE_FILE_PATH)
+        for path in list_state_deltas():
+            with open(path, "r", encoding="utf-8") as f:
+                apply_state_delta(state, json.load(f))
+        self.baseline = state_fingerprint(state)
+        return state
+
+    def save(self, state: dict) -> None:
+        deltas = list_state_deltas()
+        if not self.segmented:
+            write_state_json(state, STATE_FILE_PATH)
+            for path in deltas:
+                os.remove(path)
+            self.baseline = state_fingerprint(state)
+            return
+
+        delta = build_state_delta(self.baseline, state)
+        if not delta:
+            return
+        delta_size = sum(os.path.getsize(path) for path in deltas)
+        encoded = dump_compact_json(delta)
+        if delta_size + len(encoded.encode("utf-8")) > STATE_DELTA_FOLD_BYTES:
+            print(f"Folding {len(deltas) + 1} state delta(s) into {STATE_FILE_PATH}")
+            write_state_json(state, STATE_FILE_PATH)
+            for path in deltas:
+                os.remove(path)
+        else:
+            os.makedirs(STATE_DELTA_DIR, exist_ok=True)
+            sequence = int(os.path.basename(deltas[-1]).split("-", 1)[0]) + 1 if deltas else 1
+            stamp = datetime.datetime.now(ZoneInfo("UTC")).strftime("%Y%m%dT%H%M%SZ")
+            delta_path = os.path.join(STATE_DELTA_DIR, f"{sequence:06d}-{stamp}.json")
+            with open(delta_path, "w", encoding="utf-8") as f:
+                f.write(encoded + "\n")
+        self.baseline = state_fingerprint(state)
+
+
+class SqliteStateBackend:
+    """Row-per-job state in `STATE_DB_PATH`.
+
+    `load()` only reads the jobs matching the given filters and `save()` only
+    rewrites rows whose content changed.  Jobs that were loaded but are no
+    longer in `state["jobs"]` are deleted.  The `papers` table only holds
+    papers embedded by jobs created before the shared paper store; they move
+    to `paper_store` on the next save.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.loaded: Dict[str, dict] = {}
+        self.connection: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is not None:
+            return self.connection
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                pipeline_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at TEXT,
+                updated_at TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status);
+            CREATE TABLE IF NOT EXISTS papers (
+                pipeline_id TEXT NOT NULL,
+                paper_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (pipeline_id, paper_id)
+            );
+            CREATE INDEX IF NOT EXISTS papers_paper_id_idx ON papers (paper_id);
+            CREATE TABLE IF NOT EXISTS paper_store (
+                paper_key TEXT PRIMARY KEY,
+                base_id TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS paper_store_base_id_idx ON paper_store (base_id);
+            CREATE TABLE IF NOT EXISTS discord_messages (
+                pipeline_id TEXT NOT NULL,
+                paper_id TEXT NOT NULL,
+                message_id TEXT,
+                channel_id TEXT,
+                reaction_added INTEGER NOT NULL DEFAULT 0,
+                read_requested INTEGER NOT NULL DEFAULT 0,
+                reading_memo_sent INTEGER NOT NULL DEFAULT 0,
+                data TEXT NOT NULL,
+                PRIMARY KEY (pipeline_id, paper_id)
+            );
+            CREATE INDEX IF NOT EXISTS discord_messages_open_idx
+                ON discord_messages (reading_memo_sent, read_requested);
+            CREATE INDEX IF NOT EXISTS discord_messages_sent_idx
+                ON discord_messages (reaction_added);
+            """
+        )
+        message_columns = {row[1] for row in self.connection.execute("PRAGMA table_info(discord_messages)")}
+        if "next_check_at" not in message_columns:
+            self.connection.execute("ALTER TABLE discord_messages ADD COLUMN next_check_at TEXT")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS discord_messages_due_idx "
+            "ON discord_messages (reading_memo_sent, next_check_at)"
+        )
+        return self.connection
+
+    def import_json_state(self) -> None:
+        """Fill a new database from the JSON state and paper store."""
+        print(f"Importing {STATE_FILE_PATH} into {self.path}")
+        self.connect()
+        state = JsonStateBackend(segmented=True).load()
+        self.replace_all(state)
+        json_store = JsonPaperStore(PAPER_STORE_DIR)
+        sqlite_store = SqlitePaperStore(self)
+        for job in state["jobs"]:
+            for paper_id in job.get("paper_ids", []):
+                paper = json_store.get(paper_id)
+                if paper is not None:
+                    sqlite_store.put(paper)
+        sqlite_store.save()
+
+    def load(self, statuses: Optional[Tuple[str, ...]] = None, open_messages_only: bool = False) -> dict:
+        connection = self.connect()
+        state = empty_state()
+        for key, value in connection.execute("SELECT key, value FROM meta"):
+            state[key] = json.loads(value)
         state["jobs"] = []
+
+        if open_messages_only:
+            rows = connection.execute(
+                # one index search per branch: requested, never checked, check due
+                "SELECT pipeline_id, data FROM jobs WHERE pipeline_id IN ("
+                "SELECT pipeline_id FROM discord_messages WHERE reading_memo_sent = 0 AND read_requested = 1 "
+                "UNION SELECT pipeline_id FROM discord_messages "
+                "WHERE reading_memo_sent = 0 AND next_check_at IS NULL "
+                "UNION SELECT pipeline_id FROM discord_messages "
+                "WHERE reading_memo_sent = 0 AND next_check_at <= ?"
+                ") ORDER BY created_at, pipeline_id",
+                (reaction_check_cutoff(),),
+            ).fetchall()
+        elif statuses is None:
+            rows = connection.execute(
+                "SELECT pipeline_id, data FROM jobs ORDER BY created_at, pipeline_id"
+            ).fetchall()
+        elif len(statuses) == 0:
+            rows = []
+        else:
+            placeholders = ", ".join("?" for _ in statuses)
+            rows = connection.execute(
+                f"SELECT pipeline_id, data FROM jobs WHERE status IN ({placeholders}) "
+                "ORDER BY created_at, pipeline_id",
+                tuple(statuses),
+            ).fetchall()
+
+        self.loaded = {}
+        for pipeline_id, data in rows:
+            job = json.loads(data)
+            paper_rows = connection.execute(
+                "SELECT paper_id, data FROM papers WHERE pipeline_id = ? ORDER BY position",
+                (pipeline_id,),
+            ).fetchall()
+            message_rows = connection.execute(
+                "SELECT paper_id, data FROM discord_messages WHERE pipeline_id = ?",
+                (pipeline_id,),
+            ).fetchall()
+            if paper_rows:
+                job["papers"] = [json.loads(paper_data) for _, paper_data in paper_rows]
+            job["discord_messages"] = {
+                paper_id: json.loads(message_data) for paper_id, message_data in message_rows
+            }
+            self.loaded[pipeline_id] = {
+                "job": data,
+                "papers": {paper_id: paper_data for paper_id, paper_data in paper_rows},
+                "messages": {paper_id: message_data for paper_id, message_data in message_rows},
+            }
+            state["jobs"].append(job)
+        return state
+
+    def write_job(self, connection: sqlite3.Connection, job: dict) -> None:
+        pipeline_id = job["pipeline_id"]
+        previous = self.loaded.get(pipeline_id, {"job": None, "papers": {}, "messages": {}})
+        data = {key: value for key, value in job.items() if key not in ("papers", "discord_messages")}
+        job_data = dump_compact_json(data)
+        if job_data != previous["job"]:
+            connection.execute(
+                "INSERT INTO jobs (pipeline_id, status, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (pipeline_id) DO UPDATE SET "
+                "status = excluded.status, created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at, data = excluded.data",
+                (pipeline_id, job.get("status", ""), job.get("created_at"), job.get("updated_at"), job_data),
+            )
+
+        paper_ids = set()
+        for position, paper in enumerate(job.get("papers", [])):
+            paper_ids.add(paper["paper_id"])
+            paper_data = dump_compact_json(paper)
+            if paper_data != previous["papers"].get(paper["paper_id"]):
+                connection.execute(
+                    "INSERT OR REPLACE INTO papers (pipeline_id, paper_id, position, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (pipeline_id, paper["paper_id"], position, paper_data),
+                )
+        for paper_id in set(previous["papers"]) - paper_ids:
+            connection.execute(
+                "DELETE FROM papers WHERE pipeline_id = ? AND paper_id = ?", (pipeline_id, paper_id)
+            )
+
+        messages = job.get("discord_messages", {})
+        for paper_id, message_state in messages.items():
+            message_data = dump_compact_json(message_state)
+            if message_data != previous["messages"].get(paper_id):
+                connection.execute(
+                    "INSERT OR REPLACE INTO discord_messages (pipeline_id, paper_id, message_id, "
+                    "channel_id, reaction_added, read_requested, reading_memo_sent, next_check_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        pipeline_id,
+                        paper_id,
+                        message_state.get("message_id"),
+                        message_state.get("channel_id"),
+                        int(bool(message_state.get("reaction_added"))),
+                        int(bool(message_state.get("read_requested"))),
+                        int(bool(message_state.get("reading_memo_sent"))),
+                        message_state.get("next_check_at"),
+                        message_data,
+                    ),
+                )
+        for paper_id in set(previous["messages"]) - set(messages):
+            connection.execute(
+                "DELETE FROM discord_messages WHERE pipeline_id = ? AND paper_id = ?",
+                (pipeline_id, paper_id),
+            )
+
+    def delete_job(self, connection: sqlite3.Connection, pipeline_id: str) -> None:
+        for table in ("jobs", "papers", "discord_messages"):
+            connection.execute(f"DELETE FROM {table} WHERE pipeline_id = ?", (pipeline_id,))
+
+    def write_meta(self, connection: sqlite3.Connection, state: dict) -> None:
+        for key, value in state.items():
+            if key == "jobs":
+                continue
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, dump_compact_json(value))
+            )
+
+    def save(self, state: dict) -> None:
+        connection = self.connect()
+        with connection:
+            self.write_meta(connection, state)
+            saved_ids = set()
+            for job in state["jobs"]:
+                self.write_job(connection, job)
+                saved_ids.add(job["pipeline_id"])
+            for pipeline_id in set(self.loaded) - saved_ids:
+                self.delete_job(connection, pipeline_id)
+        self.load_snapshot(state)
+
+    def load_snapshot(self, state: dict) -> None:
+        self.loaded = {
+            job["pipeline_id"]: {
+                "job": dump_compact_json(
+                    {key: value for key, value in job.items() if key not in ("papers", "discord_messages")}
+                ),
+                "papers": {paper["paper_id"]: dump_compact_json(paper) for paper in job.get("papers", [])},
+                "messages": {
+                    paper_id: dump_compact_json(message_state)
+                    for paper_id, message_state in job.get("discord_messages", {}).items()
+                },
+            }
+            for job in state["jobs"]
+        }
+
+    def replace_all(self, state: dict) -> None:
+        connection = self.connection
+        with connection:
+            for table in ("meta", "jobs", "papers", "discord_messages", "paper_store"):
+                connection.execute(f"DELETE FROM {table}")
+            self.loaded = {}
+            self.write_meta(connection, state)
+            for job in state["jobs"]:
+                self.write_job(connection, job)
+        self.loaded = {}
+
+
+def split_arxiv_id(paper_id: str) -> Tuple[str, str]:
+    """Split an arXiv entry URL or identifier into (base ID, version)."""
+    identifier = re.sub(r"^.*?arxiv\.org/(?:abs|pdf)/", "", paper_id.strip())
+    match = re.match(r"^(.*?)(v\d+)?$", identifier)
+    return match.group(1), match.group(2) or ""
+
+
+def paper_store_key(paper_id: str) -> str:
+    base_id, version = split_arxiv_id(paper_id)
+    return base_id + version
+
+
+def paper_store_shard(paper_id: str) -> str:
+    base_id, _ = split_arxiv_id(paper_id)
+    if "/" in base_id:
+        archive, number = base_id.split("/", 1)
+        return f"{archive.replace('.', '_')}-{number[:4]}"
+    return base_id[:7] or "unknown"
+
+
+class JsonPaperStore:
+    """Papers keyed by arXiv ID and version, sharded into small JSON files.
+
+    Shards (about 1000 arXiv numbers each) are read only when a paper in them
+    is looked up and written only when they gained a paper.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.shards: Dict[str, dict] = {}
+        self.dirty = set()
+
+    def shard_path(self, shard: str) -> str:
+        return os.path.join(self.directory, f"{shard}.json")
+
+    def load_shard(self, shard: str) -> dict:
+        if shard not in self.shards:
+            path = self.shard_path(shard)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self.shards[shard] = json.load(f)
+            else:
+                self.shards[shard] = {}
+        return self.shards[shard]
+
+    def get(self, paper_id: str) -> Optional[dict]:
+        return self.load_shard(paper_store_shard(paper_id)).get(paper_store_key(paper_id))
+
+    def put(self, paper: dict) -> None:
+        shard = paper_store_shard(paper["paper_id"])
+        papers = self.load_shard(shard)
+        key = paper_store_key(paper["paper_id"])
+        if papers.get(key) != paper:
+            papers[key] = paper
+            self.dirty.add(shard)
+
+    def prune(self, keep_paper_ids: set) -> int:
+        keep_keys = {paper_store_key(paper_id) for paper_id in keep_paper_ids}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    self.load_shard(name[: -len(".json")])
+        removed = 0
+        for shard, papers in self.shards.items():
+            for key in [key for key in papers if key not in keep_keys]:
+                del papers[key]
+                removed += 1
+                self.dirty.add(shard)
+        return removed
+
+    def save(self) -> None:
+        for shard in sorted(self.dirty):
+            path = self.shard_path(shard)
+            papers = self.shards[shard]
+            if not papers:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(papers, f, ensure_ascii=False, indent=1, sort_keys=True)
+        self.dirty = set()
+
+
+class SqlitePaperStore:
+    """Same interface as JsonPaperStore, backed by the `paper_store` table."""
+
+    def __init__(self, backend: "SqliteStateBackend"):
+        self.backend = backend
+        self.cache: Dict[str, Optional[dict]] = {}
+        self.pending: Dict[str, dict] = {}
+        self.removed = set()
+
+    def get(self, paper_id: str) -> Optional[dict]:
+        key = paper_store_key(paper_id)
+        if key not in self.cache:
+            row = self.backend.connect().execute(
+                "SELECT data FROM paper_store WHERE paper_key = ?", (key,)
+            ).fetchone()
+            self.cache[key] = json.loads(row[0]) if row else None
+        return self.cache[key]
+
+    def put(self, paper: dict) -> None:
+        key = paper_store_key(paper["paper_id"])
+        if self.get(paper["paper_id"]) != paper:
+            self.cache[key] = paper
+            self.pending[key] = paper
+            self.removed.discard(key)
+
+    def prune(self, keep_paper_ids: set) -> int:
+        keep_keys = {paper_store_key(paper_id) for paper_id in keep_paper_ids}
+        keys = [row[0] for row in self.backend.connect().execute("SELECT paper_key FROM paper_store")]
+        stale = [key for key in keys if key not in keep_keys]
+        for key in stale:
+            self.cache[key] = None
+            self.pending.pop(key, None)
+            self.removed.add(key)
+        return len(stale)
+
+    def save(self) -> None:
+        connection = self.backend.connect()
+        with connection:
+            for key, paper in self.pending.items():
+                connection.execute(
+                    "INSERT OR REPLACE INTO paper_store (paper_key, base_id, data) VALUES (?, ?, ?)",
+                    (key, split_arxiv_id(paper["paper_id"])[0], dump_compact_json(paper)),
+                )
+            for key in self.removed:
+                connection.execute("DELETE FROM paper_store WHERE paper_key = ?", (key,))
+        self.pending = {}
+        self.removed = set()
+
+
+_state_backend = None
+
+
+_paper_store = None
+
+
+def get_state_backend():
+    global _state_backend
+    if _state_backend is None:
+        if STATE_BACKEND == "sqlite":
+            is_new = not os.path.exists(STATE_DB_PATH)
+            _state_backend = SqliteStateBackend(STATE_DB_PATH)
+            if is_new and os.path.exists(STATE_FILE_PATH):
+                _state_backend.import_json_state()
+        else:
+            if STATE_BACKEND != "json":
+                print(f"Unknown STATE_BACKEND {STATE_BACKEND!r}; falling back to json.")
+            _state_backend = JsonStateBackend(segmented=STATE_FORMAT != "full")
+    return _state_backend
+
+
+def get_paper_store():
+    global _paper_store
+    if _paper_store is None:
+        backend = get_state_backend()
+        if isinstance(backend, SqliteStateBackend):
+            _paper_store = SqlitePaperStore(backend)
+        else:
+            _paper_store = JsonPaperStore(PAPER_STORE_DIR)
+    return _paper_store
+
+
+def store_job_papers(job: dict, papers: List[dict]) -> None:
+    store = get_paper_store()
+    for paper in papers:
+        store.put(paper)
+    job["paper_ids"] = [paper["paper_id"] for paper in papers]
+
+
+def normalize_job_papers(state: dict) -> None:
+    """Move papers embedded in older jobs into the shared paper store."""
+    for job in state["jobs"]:
+        if "papers" in job:
+            store_job_papers(job, job.pop("papers") or [])
+
+
+def get_papers(paper_ids: List[str]) -> List[dict]:
+    store = get_paper_store()
+    papers = []
+    for paper_id in paper_ids:
+        paper = store.get(paper_id)
+        if paper is not None:
+            papers.append(paper)
+    return papers
+
+
+def get_job_papers(job: dict, paper_ids: Optional[List[str]] = None) -> List[dict]:
+    return get_papers(job.get("paper_ids", []) if paper_ids is None else paper_ids)
+
+
+_unapplied_journal_entries: List[dict] = []
+
+
+def append_state_journal(pipeline_id: str, field: str, paper_id: str, value: object) -> None:
+    """Durably record one per-paper result before the stage saves the state."""
+    parent_dir = os.path.dirname(STATE_JOURNAL_PATH)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    entry = {"pipeline_id": pipeline_id, "field": field, "paper_id": paper_id, "value": value}
+    with open(STATE_JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write(dump_compact_json(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def journal_writer(job: dict, field: str) -> Callable[[str, object], None]:
+    def write(paper_id: str, value: object) -> None:
+        append_state_journal(job["pipeline_id"], field, paper_id, value)
+
+    return write
+
+
+def read_state_journal() -> List[dict]:
+    if not os.path.exists(STATE_JOURNAL_PATH):
+        return []
+    entries = []
+    with open(STATE_JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # a run killed mid-write leaves a truncated last line
+                continue
+    return entries
+
+
+def replay_state_journal(state: dict) -> List[dict]:
+    jobs_by_id = {job.get("pipeline_id"): job for job in state["jobs"]}
+    unapplied = []
+    for entry in read_state_journal():
+        job = jobs_by_id.get(entry.get("pipeline_id"))
+        if job is None:
+            unapplied.append(entry)
+            continue
+        results = job.get(entry["field"])
+        if not isinstance(results, dict):
+            results = {}
+            job[entry["field"]] = results
+        results[entry["paper_id"]] = entry["value"]
+    return unapplied
+
+
+def rewrite_state_journal(entries: List[dict]) -> None:
+    if not entries:
+        if os.path.exists(STATE_JOURNAL_PATH):
+            os.remove(STATE_JOURNAL_PATH)
+        return
+    with open(STATE_JOURNAL_PATH, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(dump_compact_json(entry) + "\n")
+
+
+def load_state(statuses: Optional[Tuple[str, ...]] = None, open_messages_only: bool = False) -> dict:
+    """Load pipeline state.
+
+    Backends that can filter (SQLite) return only jobs whose status is in
+    `statuses`, or only jobs with Discord messages still waiting for a reading
+    memo whose reaction check is due when `open_messages_only` is set.  Callers must still check `status`.
+    Results checkpointed in the journal by an interrupted run are replayed
+    onto the loaded jobs.
+    """
+    global _unapplied_journal_entries
+    backend = get_state_backend()
+    state = backend.load(statuses, open_messages_only)
+    normalize_job_papers(state)
+    load_prompt_state(state)
+    load_batch_durations(state)
+    unapplied = replay_state_journal(state)
+    is_partial = isinstance(backend, SqliteStateBackend) and (statuses is not None or open_messages_only)
+    # entries for jobs that are not loaded survive until a load that can apply them
+    _unapplied_journal_entries = unapplied if is_partial else []
     return state
 
 
 def save_state(state: dict) -> None:
-    with open(STATE_FILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    # papers first so that saved jobs never reference a missing paper
+    get_paper_store().save()
+    get_result_cache().save()
+    get_interest_profile().save()
+    if _embedding_index is not None:
+        _embedding_index.save()
+    save_prompt_state(state)
+    save_batch_durations(state)
+    get_state_backend().save(state)
+    rewrite_state_journal(_unapplied_journal_entries)
+    write_poll_schedule(state["jobs"], backfill=state.get("backfill") or {})
+
+
+def export_state_json(path: str) -> int:
+    state = load_state()
+    write_state_json(state, path)
+    if os.path.abspath(path) == os.path.abspath(STATE_FILE_PATH):
+        # the snapshot now contains every delta
+        for delta_path in list_state_deltas():
+            os.remove(delta_path)
+    print(f"Exported {len(state['jobs'])} job(s) to {path}")
+    return 0
+
+
+def import_state_json(path: str) -> int:
+    if not os.path.exists(path):
+        print(f"{path} does not exist.")
+        return 1
+    state = read_state_json(path)
+    backend = get_state_backend()
+    if isinstance(backend, SqliteStateBackend):
+        backend.connect()
+        backend.replace_all(state)
+    else:
+        write_state_json(state, STATE_FILE_PATH)
+        for delta_path in list_state_deltas():
+            os.remove(delta_path)
+    print(f"Imported {len(state['jobs'])} job(s) from {path}")
+    return 0
+
+
+def archive_segment_path(now: datetime.datetime) -> str:
+    return os.path.join(STATE_ARCHIVE_DIR, f"jobs-{now.strftime('%Y%m%d')}.jsonl.gz")
+
+
+def append_archive_segment(jobs: List[dict], now: datetime.datetime) -> str:
+    path = archive_segment_path(now)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for job in jobs:
+            f.write(dump_compact_json(job) + "\n")
+    return path
 
 
-def search_papers():
-    # search for papers submitted yesterday
-    yesterday = datetime.datetime.now(ZoneInfo("America/New_York")) - datetime.timedelta(days=3)
-    search_start = yesterday.strftime("%Y%m%d0000")
-    search_end = yesterday.strftime("%Y%m%d2359")
-    print(f"Searching papers from {search_start} to {search_end}")
+def read_archive_segment(path: str) -> List[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
 
+
+def compact_finalized_job(job: dict, now: datetime.datetime) -> Optional[dict]:
+    """Return the part of an archived job that the reading stage still needs.
+
+    Only Discord messages without a reading memo, inside the reaction window,
+    are kept together with their paper IDs.  None means the job can leave the
+    live state entirely.
+    """
+    finalized_at = parse_iso_datetime(job.get("finalized_at") or job.get("updated_at") or "")
+    if finalized_at is None:
+        return None
+    if now - finalized_at >= datetime.timedelta(days=READING_REQUEST_WINDOW_DAYS):
+        return None
+
+    open_messages = {
+        paper_id: message_state
+        for paper_id, message_state in job.get("discord_messages", {}).items()
+        if not message_state.get("reading_memo_sent")
+    }
+    if not open_messages:
+        return None
+
+    return {
+        "pipeline_id": job["pipeline_id"],
+        "status": job["status"],
+        "compacted": True,
+        "paper_ids": [paper_id for paper_id in job.get("paper_ids", []) if paper_id in open_messages],
+        "discord_messages": open_messages,
+        "reading_memos": {
+            paper_id: memo
+            for paper_id, memo in job.get("reading_memos", {}).items()
+            if paper_id in open_messages
+        },
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "finalized_at": job.get("finalized_at"),
+        "archived_at": job.get("archived_at"),
+    }
+
+
+def run_stage_compact_state() -> int:
+    # every live job is needed to know which stored papers are still referenced
+    state = load_state()
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    to_archive = []
+    kept_jobs = []
+    unread_papers: List[dict] = []
+    dropped = 0
+    updated = False
+    for job in state["jobs"]:
+        if job.get("status") not in FINALIZED_STATUSES:
+            kept_jobs.append(job)
+            continue
+        if not job.get("archived_at"):
+            job["archived_at"] = now.isoformat()
+            to_archive.append(dict(job, papers=get_job_papers(job)))
+        compacted = compact_finalized_job(job, now)
+        if compacted is None:
+            dropped += 1
+        else:
+            kept_jobs.append(compacted)
+        updated = updated or compacted != job
+        # posted papers whose reaction window closed without a 📖 request
+        still_open = (compacted or {}).get("discord_messages", {})
+        unread_papers.extend(
+            paper
+            for paper in get_job_papers(job, list(job.get("discord_messages", {})))
+            if paper["paper_id"] not in still_open
+            and not job["discord_messages"][paper["paper_id"]].get("read_requested")
+        )
+
+    learn_interest_feedback(unread_papers, 0)
+    referenced_ids = {paper_id for job in kept_jobs for paper_id in job.get("paper_ids", [])}
+    pruned = get_paper_store().prune(referenced_ids)
+    if not updated and pruned == 0:
+        print("No finalized jobs to compact.")
+        return 0
+
+    if to_archive:
+        path = append_archive_segment(to_archive, now)
+        print(f"Archived {len(to_archive)} finalized job(s) to {path}")
+    state["jobs"] = kept_jobs
+    save_state(state)
+    print(f"Dropped {dropped} job(s) and {pruned} unreferenced paper(s) from the live state.")
+    return 0
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def result_cache_prompt_hashes() -> Dict[str, str]:
+    fused_hash = text_hash(fused_request_template.prompt)
+    # packing changes both the prompt and how many papers share one answer
+    interest_prompt = interest_request_template(INTEREST_PACK_SIZE).prompt
+    return {
+        "interest": text_hash(f"{interest_prompt}\npack_size={INTEREST_PACK_SIZE}"),
+        "summary": text_hash(prompt_summarize),
+        "fused_interest": fused_hash,
+        "fused_summary": fused_hash,
+    }
+
+
+class ResultCache:
+    """Gemini results keyed by (kind, arXiv base ID, abstract hash, prompt hash, model).
+
+    Entries written with an older prompt file are dropped on load, expired
+    entries after `RESULT_CACHE_TTL_DAYS`, and the least recently used ones
+    once there are more than `RESULT_CACHE_MAX_ENTRIES`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Optional[Dict[str, dict]] = None
+        self.dirty = False
+        self.prompt_hashes = result_cache_prompt_hashes()
+
+    def load(self) -> Dict[str, dict]:
+        if self.entries is not None:
+            return self.entries
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("entries", {})
+        now = datetime.datetime.now(ZoneInfo("UTC"))
+        ttl = datetime.timedelta(days=RESULT_CACHE_TTL_DAYS)
+        self.entries = {}
+        for key, entry in entries.items():
+            created_at = parse_iso_datetime(entry.get("created_at", ""))
+            if entry.get("prompt_hash") != self.prompt_hashes.get(entry.get("kind")):
+                continue
+            if created_at is None or now - created_at >= ttl:
+                continue
+            self.entries[key] = entry
+        self.dirty = len(self.entries) != len(entries)
+        return self.entries
+
+    def key(self, kind: str, paper: dict, model: str) -> str:
+        base_id, _ = split_arxiv_id(paper["paper_id"])
+        content_hash = text_hash(f"{paper.get('title', '')}\n{paper.get('summary', '')}")
+        return f"{kind}:{base_id}:{content_hash}:{self.prompt_hashes[kind]}:{model}"
+
+    def get(self, kind: str, paper: dict, model: str) -> Optional[dict]:
+        entry = self.load().get(self.key(kind, paper, model))
+        if entry is None:
+            return None
+        # a hit alone does not rewrite the file; the new used_at is saved with the next real change
+        entry["used_at"] = now_iso_utc()
+        return entry
+
+    def put(self, kind: str, paper: dict, model: str, value: object) -> None:
+        now = now_iso_utc()
+        self.load()[self.key(kind, paper, model)] = {
+            "kind": kind,
+            "prompt_hash": self.prompt_hashes[kind],
+            "value": value,
+            "created_at": now,
+            "used_at": now,
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty or self.entries is None:
+            return
+        if len(self.entries) > RESULT_CACHE_MAX_ENTRIES:
+            recent = sorted(self.entries.items(), key=lambda item: item[1].get("used_at", ""), reverse=True)
+            self.entries = dict(recent[:RESULT_CACHE_MAX_ENTRIES])
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        self.dirty = False
+
+
+_result_cache = None
+
+
+def get_result_cache() -> ResultCache:
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(RESULT_CACHE_PATH)
+    return _result_cache
+
+
+def result_cache_lookups(kind: str, model: str) -> List[Tuple[str, str]]:
+    """(kind, model) pairs whose cached results can stand in for a `kind` result of `model`."""
+    lookups = [(kind, model)]
+    if kind == "interest" and INTEREST_ESCALATION_MODEL:
+        # verdicts the escalation settled are final as well
+        lookups.insert(0, (kind, INTEREST_ESCALATION_MODEL))
+    if kind in ("interest", "summary"):
+        # the fused prompt answers both questions with SUMMARY_MODEL
+        lookups.append((f"fused_{kind}", SUMMARY_MODEL))
+    return lookups
+
+
+def get_cached_result(kind: str, paper: dict, model: str) -> Optional[dict]:
+    cache = get_result_cache()
+    for lookup_kind, lookup_model in result_cache_lookups(kind, model):
+        entry = cache.get(lookup_kind, paper, lookup_model)
+        if entry is not None:
+            return entry
+    return None
+
+
+def split_cached_results(kind: str, papers: List[dict], model: str) -> Tuple[Dict[str, object], List[dict]]:
+    """Return cached results by paper ID and the papers that still need Gemini."""
+    cached: Dict[str, object] = {}
+    misses = []
+    for paper in papers:
+        entry = get_cached_result(kind, paper, model)
+        if entry is None:
+            misses.append(paper)
+        else:
+            cached[paper["paper_id"]] = entry["value"]
+    if cached:
+        print(f"Reused {len(cached)} cached {kind} result(s); {len(misses)} paper(s) need Gemini.")
+    return cached, misses
+
+
+def cache_results(kind: str, papers: List[dict], results: Dict[str, object], model: str) -> None:
+    cache = get_result_cache()
+    for paper in papers:
+        if paper["paper_id"] in results:
+            cache.put(kind, paper, model, results[paper["paper_id"]])
+
+
+def harvest_windows(
+    high_water_mark: Optional[datetime.datetime], now: datetime.datetime
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """Split the not yet harvested range into `[start, end)` windows.
+
+    arXiv needs a few days to index new submissions, so the range stops at the
+    end of the day `HARVEST_LAG_DAYS` ago.  Without a high-water mark only
+    that single day is harvested.
+    """
+    lagged_day = (now.astimezone(ARXIV_TIMEZONE) - datetime.timedelta(days=HARVEST_LAG_DAYS)).date()
+    next_day = lagged_day + datetime.timedelta(days=1)
+    upper = datetime.datetime.combine(next_day, datetime.time(), ARXIV_TIMEZONE)
+    if high_water_mark is None:
+        start = upper - datetime.timedelta(days=1)
+    else:
+        start = high_water_mark.astimezone(ARXIV_TIMEZONE)
+
+    windows = []
+    step = datetime.timedelta(hours=HARVEST_WINDOW_HOURS)
+    while start < upper and len(windows) < HARVEST_MAX_WINDOWS:
+        end = min(start + step, upper)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
+class RequestSpacer:
+    """Thread-safe minimum interval between requests shared by several workers."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval_seconds
+        if slot > now:
+            time.sleep(slot - now)
+
+
+arxiv_request_spacer = RequestSpacer(ARXIV_REQUEST_INTERVAL_SECONDS)
+
+
+def arxiv_category_queries() -> List[str]:
+    if ARXIV_CATEGORIES == ["all"]:
+        return [""]
+    groups = [
+        ARXIV_CATEGORIES[i : i + ARXIV_CATEGORY_GROUP_SIZE]
+        for i in range(0, len(ARXIV_CATEGORIES), ARXIV_CATEGORY_GROUP_SIZE)
+    ]
+    return ["(" + " OR ".join(f"cat:{category}" for category in group) + ")" for group in groups]
+
+
+def fetch_arxiv_page(client: arxiv.Client, search: arxiv.Search, offset: int) -> List[arxiv.Result]:
+    for attempt in range(1, ARXIV_MAX_ATTEMPTS + 1):
+        arxiv_request_spacer.wait()
+        try:
+            # islice stops the client generator before it requests the following page
+            return list(itertools.islice(client.results(search, offset=offset), ARXIV_PAGE_SIZE))
+        except (arxiv.HTTPError, requests.exceptions.ConnectionError) as exc:
+            if attempt >= ARXIV_MAX_ATTEMPTS:
+                raise
+            print(f"arXiv request failed ({short_error(exc, 120)}); retrying")
+
+
+def search_papers(
+    start: datetime.datetime, end: datetime.datetime, category_query: str, offset: int = 0
+):
+    """Yield `(next_offset, serialized papers)` one arXiv result page at a time.
+
+    `next_offset` is the cursor to pass back in to resume after that page.
+    """
+    # submittedDate bounds are inclusive and have minute resolution
+    search_start = start.astimezone(ARXIV_TIMEZONE).strftime("%Y%m%d%H%M")
+    search_end = (end.astimezone(ARXIV_TIMEZONE) - datetime.timedelta(minutes=1)).strftime("%Y%m%d%H%M")
+    print(f"Searching {category_query or 'all categories'} from {search_start} to {search_end}")
+
+    date_query = f"submittedDate:[{search_start} TO {search_end}]"
     search = arxiv.Search(
-        query=f"(cat:math.DS OR cat:math.CO OR cat:math.GR OR cat:cs.LO OR cat:cs.FL OR cat:cs.DM) AND submittedDate:[{search_start} TO {search_end}]",
+        query=f"{category_query} AND {date_query}" if category_query else date_query,
         max_results=None,
         sort_by=arxiv.SortCriterion.SubmittedDate,
     )
+    # every request, retries included, goes through the shared spacer instead of the client's own delay
+    client = arxiv.Client(page_size=ARXIV_PAGE_SIZE, delay_seconds=0, num_retries=0)
+
+    while True:
+        page = fetch_arxiv_page(client, search, offset)
+        # the client drops entries with missing fields, so a short page is not necessarily the last
+        # one; the next page then overlaps by the dropped count and duplicates are merged by entry ID
+        if not page:
+            return
+        offset += len(page)
+        yield offset, [serialize_paper(result) for result in page]
+
+
+def search_papers_parallel(
+    start: datetime.datetime, end: datetime.datetime, offsets: Dict[str, int], queries: List[str]
+):
+    """Run every category query concurrently and yield their pages as they arrive.
+
+    Yields `(query, next_offset, papers, error)`; `next_offset` is None once
+    a query finished, either completely or with `error`.
+    """
+    if not queries:
+        return
+    results: "queue.Queue[tuple]" = queue.Queue()
 
-    results = client_arxiv.results(search)
-    return results
+    def fetch(query: str) -> None:
+        try:
+            for next_offset, papers in search_papers(start, end, query, offsets.get(query, 0)):
+                results.put((query, next_offset, papers, None))
+            results.put((query, None, [], None))
+        except Exception as exc:
+            results.put((query, None, [], exc))
+
+    with ThreadPoolExecutor(max_workers=min(ARXIV_FETCH_CONCURRENCY, len(queries))) as executor:
+        for query in queries:
+            executor.submit(fetch, query)
+        remaining = len(queries)
+        while remaining:
+            item = results.get()
+            if item[1] is None:
+                remaining -= 1
+            yield item
 
 
 def serialize_paper(result: arxiv.Result) -> dict:
@@ -184,61 +1420,391 @@ def serialize_paper(result: arxiv.Result) -> dict:
     }
 
 
-def submit_interest_batch(papers: List[dict]) -> str:
-    if len(papers) == 0:
-        return ""
+def parse_interest_check(text: str) -> Tuple[bool, float]:
+    check = InterestCheck.model_validate_json(text)
+    return check.interested_in, check.confidence
 
-    inline_request: List[dict] = []
-    for paper in papers:
-        title = f"\nTitle: {paper['title']}\n"
-        abstract = f"\nAbstract: {paper['summary']}\n"
-        request_item = {
-            "contents": [{"parts": [{"text": title + abstract + prompt_check_interest}]}],
-            "config": {
-                "response_mime_type": "application/json",
-                "response_schema": InterestCheck,
-            },
+
+def parse_summary(text: str) -> dict:
+    summary = Summary.model_validate_json(text)
+    return {
+        "title": summary.title,
+        "summary": summary.summary,
+        "keywords": summary.keywords,
+        "appendix": summary.appendix,
+    }
+
+
+def parse_fused_check(text: str) -> Tuple[bool, float, Optional[dict]]:
+    check = FusedCheck.model_validate_json(text)
+    summary = None
+    if check.interested_in and check.summary:
+        summary = parse_summary(check.summary.model_dump_json())
+    return check.interested_in, check.confidence, summary
+
+
+def parse_packed_interest_checks(text: str) -> List[Tuple[str, Tuple[bool, float]]]:
+    return [
+        (item.paper_id, (item.interested_in, item.confidence))
+        for item in PackedInterestChecks.model_validate_json(text).results
+    ]
+
+
+class BatchRequestTemplate:
+    """Request body shared by every request of a batch; only the titles and abstracts vary.
+
+    The fixed prompt is sent first as the system instruction so that every
+    request starts with the same prefix. The response schema is converted to
+    JSON schema once for the file-based batch instead of being serialized
+    again for each request. With `pack_size` > 1 each request carries
+    several papers, labelled by ID, and `parse` returns (paper_id, value)
+    pairs for the whole pack.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        prompt: str,
+        schema: type,
+        parse: Callable[[str], object],
+        generation_config: Optional[dict] = None,
+        pack_size: int = 1,
+    ):
+        self.kind = kind
+        self.prompt = prompt
+        self.parse = parse
+        self.pack_size = pack_size
+        extra_config = dict(generation_config or {})
+        self.config = {
+            "response_mime_type": "application/json",
+            "response_schema": schema,
+            **extra_config,
+        }
+        self.file_config = {
+            "response_mime_type": "application/json",
+            "response_json_schema": schema.model_json_schema(),
+            **extra_config,
         }
-        inline_request.append(request_item)
 
-    batch_job = client_genai.batches.create(
-        model=INTEREST_MODEL,
-        src=inline_request,
-        config={"display_name": "Interest Check Batch Job"},
-    )
-    print(f"Interest batch job created: {batch_job.name}")
-    print(f"Number of papers in batch: {len(inline_request)}")
-    return batch_job.name
+    def units(self, papers: List[dict]) -> List[List[dict]]:
+        return [papers[i : i + self.pack_size] for i in range(0, len(papers), self.pack_size)]
+
+    def key(self, unit: List[dict]) -> str:
+        return ",".join(paper["paper_id"] for paper in unit)
+
+    def contents(self, unit: List[dict]) -> List[dict]:
+        if self.pack_size == 1:
+            paper = unit[0]
+            text = f"\nTitle: {paper['title']}\n" + f"\nAbstract: {paper['summary']}\n"
+        else:
+            text = "".join(
+                f"\n[paper_id: {paper_store_key(paper['paper_id'])}]\n"
+                f"Title: {paper['title']}\nAbstract: {paper['summary']}\n"
+                for paper in unit
+            )
+        return [{"parts": [{"text": text}]}]
 
+    def file_line(self, unit: List[dict]) -> str:
+        request = {
+            "system_instruction": {"parts": [{"text": self.prompt}]},
+            "contents": self.contents(unit),
+            "generation_config": self.file_config,
+        }
+        return dump_compact_json({"key": self.key(unit), "request": request}) + "\n"
+
+    def parse_unit(self, text: str, unit: List[dict]) -> Tuple[dict, Dict[str, str]]:
+        if self.pack_size == 1:
+            return {unit[0]["paper_id"]: self.parse(text)}, {}
+
+        # every paper of the pack must be answered exactly once; the rest is re-queued
+        paper_ids = {split_arxiv_id(paper["paper_id"])[0]: paper["paper_id"] for paper in unit}
+        answers: Dict[str, list] = {}
+        for item_id, value in self.parse(text):
+            paper_id = paper_ids.get(split_arxiv_id(item_id)[0])
+            if paper_id is not None:
+                answers.setdefault(paper_id, []).append(value)
+        results: dict = {}
+        errors: Dict[str, str] = {}
+        for paper_id in paper_ids.values():
+            values = answers.get(paper_id, [])
+            if len(values) == 1:
+                results[paper_id] = values[0]
+            else:
+                errors[paper_id] = "missing from packed response" if not values else "answered more than once"
+        return results, errors
 
-def submit_summary_batch(papers: List[dict]) -> str:
-    if len(papers) == 0:
-        return ""
 
-    inline_request: List[dict] = []
-    for paper in papers:
-        title = f"\nTitle: {paper['title']}\n"
-        abstract = f"\nAbstract: {paper['summary']}\n"
-        request_item = {
-            "contents": [{"parts": [{"text": title + abstract + prompt_summarize}]}],
-            "config": {
-                "response_mime_type": "application/json",
-                "response_schema": Summary,
-                "thinking_config": {"thinking_level": "low"},
-            },
+interest_request_templates: Dict[int, BatchRequestTemplate] = {}
+summary_request_template = BatchRequestTemplate(
+    "summary", prompt_summarize, Summary, parse_summary, {"thinking_config": {"thinking_level": "low"}}
+)
+
+
+fused_request_template = BatchRequestTemplate(
+    "fused",
+    prompt_check_interest + prompt_check_interest_and_summarize + prompt_summarize,
+    FusedCheck,
+    parse_fused_check,
+    {"thinking_config": {"thinking_level": "low"}},
+)
+
+
+def interest_request_template(pack_size: int = INTEREST_PACK_SIZE) -> BatchRequestTemplate:
+    if pack_size not in interest_request_templates:
+        if pack_size == 1:
+            template = BatchRequestTemplate(
+                "interest", prompt_check_interest, InterestCheck, parse_interest_check
+            )
+        else:
+            template = BatchRequestTemplate(
+                "interest",
+                prompt_check_interest + prompt_check_interest_packed,
+                PackedInterestChecks,
+                parse_packed_interest_checks,
+                pack_size=pack_size,
+            )
+        interest_request_templates[pack_size] = template
+    return interest_request_templates[pack_size]
+
+
+PREFILTER_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to we which "
+    "with not can also these such into than then there where when while using show prove paper results "
+    "study new based two one given under via all any some each".split()
+)
+
+
+def text_terms(text: str) -> List[str]:
+    """Lower-cased words without stopwords, followed by their adjacent pairs."""
+    words = re.findall(r"[a-z][a-z0-9\-]+", text.lower())
+    words = [word for word in words if word not in PREFILTER_STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def interest_field_phrases(prompt: str) -> List[str]:
+    """Comma-separated phrases listed under the "## 興味ある分野" heading of the interest prompt."""
+    match = re.search(r"^## 興味ある分野\s*\n(.*?)(?=^## |\Z)", prompt, re.MULTILINE | re.DOTALL)
+    if match is None:
+        return []
+    return [phrase.strip() for phrase in re.split(r"[,、\n]", match.group(1)) if phrase.strip()]
+
+
+class InterestProfile:
+    """Top terms of recent papers the interest model accepted, stored next to the state."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.positives: Optional[List[dict]] = None
+        self.dirty = False
+
+    def load(self) -> List[dict]:
+        if self.positives is None:
+            self.positives = []
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.positives = json.load(f).get("positives", [])
+        return self.positives
+
+    def add(self, papers: List[dict]) -> None:
+        positives = self.load()
+        known = {entry["id"] for entry in positives}
+        for paper in papers:
+            base_id, _ = split_arxiv_id(paper["paper_id"])
+            if base_id in known:
+                continue
+            counts = Counter(text_terms(f"{paper['title']} {paper['summary']}"))
+            terms = dict(counts.most_common(PREFILTER_PROFILE_TERMS_PER_PAPER))
+            positives.append({"id": base_id, "terms": terms})
+            known.add(base_id)
+            self.dirty = True
+        del positives[:-PREFILTER_PROFILE_MAX_POSITIVES]
+
+    def save(self) -> None:
+        if not self.dirty or self.positives is None:
+            return
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"positives": self.positives}, f, ensure_ascii=False, separators=(",", ":"))
+        self.dirty = False
+
+
+_interest_profile = None
+
+
+def get_interest_profile() -> InterestProfile:
+    global _interest_profile
+    if _interest_profile is None:
+        _interest_profile = InterestProfile(PREFILTER_PROFILE_PATH)
+    return _interest_profile
+
+
+class InterestPrefilter:
+    """TF-IDF similarity between each paper and the interest profile, plus keyword rules.
+
+    The profile is the field list of the interest prompt together with the
+    terms of past positives. Papers mentioning a listed field verbatim are
+    never rejected.
+    """
+
+    def __init__(self, phrases: List[str], positives: List[dict]):
+        self.patterns = [re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE) for phrase in phrases]
+        self.field_doc = Counter(text_terms(" . ".join(phrases)))
+        self.positive_docs = [Counter(entry["terms"]) for entry in positives]
+
+    def score(self, papers: List[dict]) -> Dict[str, Tuple[float, str]]:
+        """Return {paper_id: (similarity, decision)} with decision "reject", "accept" or "llm"."""
+        docs = [Counter(text_terms(f"{paper['title']} {paper['summary']}")) for paper in papers]
+        document_frequency: Counter = Counter()
+        for counts in docs + [self.field_doc] + self.positive_docs:
+            document_frequency.update(counts.keys())
+        total = len(docs) + 1 + len(self.positive_docs)
+
+        def vector(counts: Counter) -> Dict[str, float]:
+            weights = {
+                term: (1 + math.log(count)) * (math.log((total + 1) / (document_frequency[term] + 1)) + 1)
+                for term, count in counts.items()
+            }
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            return {term: weight / norm for term, weight in weights.items()}
+
+        # the prompt fields weigh as much as all past positives together
+        profile: Dict[str, float] = dict(vector(self.field_doc))
+        for counts in self.positive_docs:
+            for term, weight in vector(counts).items():
+                profile[term] = profile.get(term, 0.0) + weight / len(self.positive_docs)
+        profile_norm = math.sqrt(sum(weight * weight for weight in profile.values())) or 1.0
+
+        decisions: Dict[str, Tuple[float, str]] = {}
+        for paper, counts in zip(papers, docs):
+            similarity = sum(weight * profile.get(term, 0.0) for term, weight in vector(counts).items())
+            similarity /= profile_norm
+            text = f"{paper['title']} {paper['summary']}"
+            if similarity >= PREFILTER_ACCEPT_ABOVE:
+                decision = "accept"
+            elif similarity < PREFILTER_REJECT_BELOW and not any(p.search(text) for p in self.patterns):
+                decision = "reject"
+            else:
+                decision = "llm"
+            decisions[paper["paper_id"]] = (similarity, decision)
+        return decisions
+
+
+def get_interest_prefilter() -> Optional[InterestPrefilter]:
+    if PREFILTER_MODE not in ("log", "apply"):
+        return None
+    return InterestPrefilter(interest_field_phrases(prompt_check_interest), get_interest_profile().load())
+
+
+class InterestBatchBuilder:
+    """Collects papers as they are fetched and decides which of them need a batch request.
+
+    Papers with a cached verdict get their result immediately and never
+    become a request.
+    """
+
+    def __init__(self, prefilter: Optional[InterestPrefilter] = None):
+        self.prefilter = prefilter
+        self.papers: List[dict] = []
+        self.cached_results: Dict[str, object] = {}
+        self.batch_papers: List[dict] = []
+        self.prefilter_scores: Dict[str, list] = {}
+        self.interest_scores: Dict[str, float] = {}
+        self.fused = False
+
+    def add(self, paper: dict) -> None:
+        self.papers.append(paper)
+        entry = get_cached_result("interest", paper, INTEREST_MODEL)
+        if entry is not None:
+            self.cached_results[paper["paper_id"]] = entry["value"]
+            return
+        self.batch_papers.append(paper)
+
+    def apply_prefilter(self) -> None:
+        if self.prefilter is None or not self.batch_papers:
+            return
+        decisions = self.prefilter.score(self.batch_papers)
+        self.prefilter_scores = {
+            paper_id: [round(similarity, 4), decision]
+            for paper_id, (similarity, decision) in decisions.items()
         }
-        inline_request.append(request_item)
+        counts = Counter(decision for _, decision in decisions.values())
+        print(
+            f"Prefilter ({PREFILTER_MODE}): {counts['reject']} reject, {counts['accept']} accept, "
+            f"{counts['llm']} to the model"
+        )
+        if PREFILTER_MODE != "apply":
+            return
+        for paper_id, (_, decision) in decisions.items():
+            if decision != "llm":
+                self.cached_results[paper_id] = decision == "accept"
+        self.batch_papers = [paper for paper in self.batch_papers if decisions[paper["paper_id"]][1] == "llm"]
+
+    def submit(self) -> str:
+        if self.cached_results:
+            print(f"Reused {len(self.cached_results)} cached interest result(s).")
+        self.apply_prefilter()
+        if INTEREST_ENGINE == "embedding" and self.batch_papers:
+            results, _ = check_interest_embedding_papers(self.batch_papers, scores=self.interest_scores)
+            self.cached_results.update(results)
+            # papers the index could not score still go to the model
+            self.batch_papers = [paper for paper in self.batch_papers if paper["paper_id"] not in results]
+        if INTEREST_FUSED_MODE == "auto" and 0 < len(self.batch_papers) <= INTEREST_FUSED_MAX_PAPERS:
+            self.fused = True
+            return submit_fused_batch(self.batch_papers)
+        return submit_interest_batch(self.batch_papers)
+
+
+def upload_batch_request_file(template: BatchRequestTemplate, papers: List[dict], display_name: str) -> str:
+    """Write one JSONL line per paper to a temporary file and upload it for a file-sourced batch."""
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+        path = f.name
+        for unit in template.units(papers):
+            f.write(template.file_line(unit))
+    try:
+        uploaded_file = client_genai.files.upload(
+            file=path,
+            config={"display_name": display_name, "mime_type": "jsonl"},
+        )
+    finally:
+        os.remove(path)
+    print(f"Uploaded batch request file: {uploaded_file.name}")
+    return uploaded_file.name
 
+
+def submit_batch(model: str, template: BatchRequestTemplate, papers: List[dict], display_name: str) -> str:
+    if len(papers) == 0:
+        return ""
+
+    # inline responses do not echo request metadata; file results carry the key of every line
+    units = template.units(papers)
     batch_job = client_genai.batches.create(
-        model=SUMMARY_MODEL,
-        src=inline_request,
-        config={"display_name": "Summarize Paper Batch Job"},
+        model=model,
+        src=upload_batch_request_file(template, papers, display_name),
+        config={"display_name": display_name},
     )
-    print(f"Summary batch job created: {batch_job.name}")
-    print(f"Number of papers in batch: {len(inline_request)}")
+    print(f"{display_name} created: {batch_job.name}")
+    print(f"Number of papers in batch: {len(papers)} ({len(units)} request(s))")
     return batch_job.name
 
 
+def interest_tier_model(tier: int) -> str:
+    return INTEREST_ESCALATION_MODEL if tier >= 2 and INTEREST_ESCALATION_MODEL else INTEREST_MODEL
+
+
+def submit_interest_batch(papers: List[dict], model: str = INTEREST_MODEL) -> str:
+    return submit_batch(model, interest_request_template(), papers, "Interest Check Batch Job")
+
+
+def submit_fused_batch(papers: List[dict]) -> str:
+    return submit_batch(SUMMARY_MODEL, fused_request_template, papers, "Fused Interest and Summary Batch Job")
+
+
+def submit_summary_batch(papers: List[dict]) -> str:
+    return submit_batch(SUMMARY_MODEL, summary_request_template, papers, "Summarize Paper Batch Job")
+
+
 def poll_batch_once(batch_name: str):
     if not batch_name:
         return None
@@ -247,6 +1813,146 @@ def poll_batch_once(batch_name: str):
     return batch_job
 
 
+_batch_durations: List[dict] = []
+
+
+def load_batch_durations(state: dict) -> None:
+    _batch_durations[:] = state.get("batch_durations") or []
+
+
+def save_batch_durations(state: dict) -> None:
+    if _batch_durations:
+        state["batch_durations"] = _batch_durations[-BATCH_DURATION_HISTORY:]
+
+
+def predict_batch_seconds(model: str, items: int) -> Optional[float]:
+    """Median duration of the past batches of `model`, each scaled to `items`."""
+    offset = BATCH_DURATION_ITEM_OFFSET
+    scaled = sorted(
+        entry["seconds"] * (items + offset) / (entry["items"] + offset)
+        for entry in _batch_durations
+        if entry.get("model") == model
+    )
+    if not scaled:
+        return None
+    return scaled[len(scaled) // 2]
+
+
+def schedule_batch_poll(job: dict) -> None:
+    """Set `next_poll_at` of a running batch; polls get denser as the predicted completion nears."""
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    submitted_at = parse_iso_datetime(job.get("batch_submitted_at", "")) or now
+    wait_seconds = BATCH_POLL_MIN_MINUTES * 60
+    predicted = predict_batch_seconds(job.get("batch_model", ""), int(job.get("batch_items", 0)))
+    if predicted is not None:
+        remaining = predicted - (now - submitted_at).total_seconds()
+        wait_seconds = min(max(wait_seconds, remaining / 2), BATCH_POLL_MAX_MINUTES * 60)
+    # the timeout handling must still run on time
+    deadline = max(submitted_at + datetime.timedelta(hours=BATCH_TIMEOUT_HOURS), now)
+    job["next_poll_at"] = min(now + datetime.timedelta(seconds=wait_seconds), deadline).isoformat()
+
+
+def start_batch_clock(job: dict, model: str, items: int) -> None:
+    job["batch_submitted_at"] = now_iso_utc()
+    job["batch_model"] = model
+    job["batch_items"] = items
+    schedule_batch_poll(job)
+
+
+def finish_batch_clock(job: dict, batch_job) -> None:
+    """Remember how long a finished batch took so later batches are polled around their completion."""
+    job.pop("next_poll_at", None)
+    create_time = getattr(batch_job, "create_time", None)
+    end_time = getattr(batch_job, "end_time", None)
+    if batch_job.state.name != "JOB_STATE_SUCCEEDED" or not job.get("batch_model"):
+        return
+    if not create_time or not end_time:
+        return
+    _batch_durations.append({
+        "model": job["batch_model"],
+        "items": int(job.get("batch_items", 0)),
+        "seconds": (end_time - create_time).total_seconds(),
+    })
+    del _batch_durations[:-BATCH_DURATION_HISTORY]
+
+
+def is_batch_poll_due(job: dict) -> bool:
+    next_poll_at = parse_iso_datetime(job.get("next_poll_at", ""))
+    return next_poll_at is None or next_poll_at <= datetime.datetime.now(ZoneInfo("UTC"))
+
+
+def read_poll_schedule() -> dict:
+    if not os.path.exists(POLL_SCHEDULE_PATH):
+        return {}
+    try:
+        with open(POLL_SCHEDULE_PATH, "r", encoding="utf-8") as f:
+            schedule = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return schedule if isinstance(schedule, dict) else {}
+
+
+def poll_stage_for_job(job: dict) -> Optional[str]:
+    if job.get("status") in INTEREST_ACTIVE_STATUSES:
+        return "poll_interest_submit_summary"
+    if job.get("status") in SUMMARY_ACTIVE_STATUSES:
+        return "poll_summary_send"
+    return None
+
+
+def write_poll_schedule(
+    jobs: List[dict], stage: Optional[str] = None, backfill: Optional[dict] = None
+) -> None:
+    """Update `POLL_SCHEDULE_PATH`, which the workflows read before installing anything.
+
+    Entries of `jobs` are replaced.  With `stage`, every other entry of that
+    stage is dropped because the stage has just loaded all of its jobs.
+    """
+    schedule = read_poll_schedule()
+    entries = {
+        pipeline_id: entry
+        for pipeline_id, entry in (schedule.get("jobs") or {}).items()
+        if entry.get("stage") != stage
+    }
+    for job in jobs:
+        job_stage = poll_stage_for_job(job)
+        if job_stage is None:
+            entries.pop(job["pipeline_id"], None)
+            continue
+        # jobs that are not waiting for a batch are due on the next run
+        next_poll_at = job.get("next_poll_at", "") if job.get("status") in BATCH_WAITING_STATUSES else ""
+        entries[job["pipeline_id"]] = {"stage": job_stage, "next_poll_at": next_poll_at}
+    schedule["jobs"] = entries
+    if backfill is not None:
+        schedule["backfill_pending"] = bool(backfill.get("windows") or backfill.get("chunks"))
+
+    parent_dir = os.path.dirname(POLL_SCHEDULE_PATH)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    temp_path = f"{POLL_SCHEDULE_PATH}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(schedule, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temp_path, POLL_SCHEDULE_PATH)
+
+
+def is_poll_stage_due(stage: str) -> bool:
+    """True when a job of `stage` is due; without a schedule file every run is due."""
+    if POLL_FORCE:
+        return True
+    schedule = read_poll_schedule()
+    if "jobs" not in schedule:
+        return True
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    for entry in schedule["jobs"].values():
+        if entry.get("stage") != stage:
+            continue
+        next_poll_at = parse_iso_datetime(entry.get("next_poll_at", ""))
+        if next_poll_at is None or next_poll_at <= now:
+            return True
+    return False
+
+
 def cancel_batch_safely(batch_name: str) -> bool:
     if not batch_name:
         return False
@@ -277,74 +1983,460 @@ def format_item_errors(prefix: str, errors: Dict[str, str], limit: int = 3) -> s
     return f"{prefix} ({len(errors)} item(s)): {details}"
 
 
+class TokenBucket:
+    """Thread-safe bucket refilled continuously at `rate_per_minute`, holding at most one minute of budget."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = rate_per_minute
+        self.rate_per_second = rate_per_minute / 60
+        self.tokens = rate_per_minute
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens (possibly going into debt) and return how long the caller must wait."""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+            self.updated_at = now
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate_per_second
+
+
+gemini_request_bucket = TokenBucket(GEMINI_RPM)
+gemini_token_bucket = TokenBucket(GEMINI_TPM)
+
+
+def estimate_tokens(contents: object) -> int:
+    if isinstance(contents, str):
+        return len(contents) // 4 + GEMINI_OUTPUT_TOKEN_ESTIMATE
+    if isinstance(contents, list):
+        return sum(estimate_tokens(part) for part in contents)
+    return GEMINI_PDF_TOKEN_ESTIMATE
+
+
+def is_retryable_gemini_error(exc: Exception) -> bool:
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code in GEMINI_RETRYABLE_CODES
+    # google-genai talks to the API through httpx, not requests
+    return isinstance(exc, (httpx.TransportError, httpx.TimeoutException))
+
+
+def call_gemini(request: Callable[[], object], estimated_tokens: int):
+    """Run `request` behind the shared RPM/TPM buckets, retrying 429/5xx with jittered backoff."""
+    for attempt in range(1, GEMINI_MAX_ATTEMPTS + 1):
+        delay = max(gemini_request_bucket.reserve(1), gemini_token_bucket.reserve(estimated_tokens))
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            return request()
+        except Exception as exc:
+            if attempt >= GEMINI_MAX_ATTEMPTS or not is_retryable_gemini_error(exc):
+                raise
+            backoff = min(GEMINI_RETRY_MAX_BACKOFF_SECONDS, GEMINI_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            backoff = random.uniform(backoff / 2, backoff)
+            print(f"Gemini request failed ({short_error(exc, 120)}); retrying in {backoff:.1f}s")
+            time.sleep(backoff)
+
+
+def gemini_generate_content(model: str, contents: object, config: dict, estimated_tokens: int = 0):
+    return call_gemini(
+        lambda: client_genai.models.generate_content(model=model, contents=contents, config=config),
+        estimated_tokens or estimate_tokens(contents),
+    )
+
+
+_prompt_caches: Dict[str, dict] = {}
+_token_usage: Dict[str, Dict[str, int]] = {}
+_token_usage_lock = threading.Lock()
+
+
+def get_prompt_cache(model: str, instruction: str) -> Optional[str]:
+    """Name of an explicit cached context holding `instruction`, created once per model until it expires."""
+    key = f"{model}:{text_hash(instruction)}"
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    entry = _prompt_caches.get(key)
+    if entry is not None:
+        expire_time = parse_iso_datetime(entry.get("expire_time", ""))
+        # leave a margin so a request never races the expiry; failed creations are retried after the TTL
+        if expire_time is not None and expire_time - now > datetime.timedelta(minutes=5):
+            return entry.get("name")
+
+    ttl = datetime.timedelta(hours=GEMINI_PROMPT_CACHE_TTL_HOURS)
+    try:
+        cache = client_genai.caches.create(
+            model=model,
+            config={
+                "system_instruction": instruction,
+                "ttl": f"{int(ttl.total_seconds())}s",
+                "display_name": f"arxiv-bot {key}"[:128],
+            },
+        )
+    except Exception as exc:
+        print(f"Prompt cache creation failed for {model}: {short_error(exc)}")
+        _prompt_caches[key] = {"name": None, "expire_time": (now + ttl).isoformat()}
+        return None
+    expire_time = cache.expire_time or now + ttl
+    _prompt_caches[key] = {"name": cache.name, "expire_time": expire_time.isoformat()}
+    print(f"Prompt cache created: {cache.name}")
+    return cache.name
+
+
+def prompt_config(model: str, instruction: str, config: dict) -> dict:
+    """Config for a direct request with `instruction` in front of the per-paper contents."""
+    cache_name = get_prompt_cache(model, instruction) if GEMINI_PROMPT_CACHE == "explicit" else None
+    if cache_name:
+        return dict(config, cached_content=cache_name)
+    return dict(config, system_instruction=instruction)
+
+
+def record_token_usage(kind: str, response) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    with _token_usage_lock:
+        counts = _token_usage.setdefault(kind, {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0})
+        counts["requests"] += 1
+        counts["prompt_tokens"] += usage.prompt_token_count or 0
+        counts["cached_tokens"] += usage.cached_content_token_count or 0
+
+
+def load_prompt_state(state: dict) -> None:
+    _prompt_caches.clear()
+    _prompt_caches.update(state.get("prompt_caches") or {})
+
+
+def save_prompt_state(state: dict) -> None:
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    if _prompt_caches or "prompt_caches" in state:
+        state["prompt_caches"] = {
+            key: entry
+            for key, entry in _prompt_caches.items()
+            if (parse_iso_datetime(entry.get("expire_time", "")) or now) > now
+        }
+    with _token_usage_lock:
+        for kind, counts in _token_usage.items():
+            totals = state.setdefault("token_usage", {}).setdefault(kind, {})
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+            print(
+                f"Gemini {kind}: {counts['cached_tokens']} of {counts['prompt_tokens']} prompt tokens "
+                f"served from cache ({counts['requests']} response(s))"
+            )
+        _token_usage.clear()
+
+
+def run_gemini_tasks(items: List[dict], task: Callable[[dict], object]):
+    """Run `task` for each item on a small pool, yielding (index, item, result, error) as they finish.
+
+    Results are yielded to the calling thread so journal and cache writes stay single-threaded.
+    """
+    if not items:
+        return
+    with ThreadPoolExecutor(max_workers=min(GEMINI_CONCURRENCY, len(items))) as executor:
+        futures = {executor.submit(task, item): (index, item) for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index, item = futures[future]
+            try:
+                yield index, item, future.result(), None
+            except Exception as exc:
+                yield index, item, None, exc
+
+
 def check_interest_sequential_papers(
-    papers: List[dict], existing_results: Optional[Dict[str, bool]] = None
+    papers: List[dict],
+    existing_results: Optional[Dict[str, bool]] = None,
+    on_result: Optional[Callable[[str, object], None]] = None,
+    confidences: Optional[Dict[str, float]] = None,
 ) -> Tuple[Dict[str, bool], Dict[str, str]]:
-    print("Checking interest sequentially...")
+    print("Checking interest with individual requests...")
     interest_results = dict(existing_results or {})
     errors: Dict[str, str] = {}
-    for i, paper in enumerate(papers):
-        paper_id = paper["paper_id"]
-        if paper_id in interest_results:
-            continue
+    pending = [paper for paper in papers if paper["paper_id"] not in interest_results]
+    template = interest_request_template(1)
+    config = prompt_config(INTEREST_MODEL, template.prompt, template.config) if pending else {}
 
-        title = f"\nTitle: {paper['title']}\n"
-        abstract = f"\nAbstract: {paper['summary']}\n"
-        try:
-            response = client_genai.models.generate_content(
-                model=INTEREST_MODEL,
-                contents=title + abstract + prompt_check_interest,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": InterestCheck,
-                },
-            )
-            is_interest = InterestCheck.model_validate_json(response.text)
-            interest_results[paper_id] = is_interest.interested_in
-            print(f"Result for paper {i + 1}: Interested: {is_interest.interested_in}")
-        except Exception as exc:
+    def check(paper: dict) -> Tuple[bool, float]:
+        response = gemini_generate_content(
+            model=INTEREST_MODEL, contents=template.contents([paper]), config=config
+        )
+        record_token_usage("interest", response)
+        return template.parse(response.text)
+
+    for i, paper, verdict, exc in run_gemini_tasks(pending, check):
+        paper_id = paper["paper_id"]
+        if exc is not None:
             errors[paper_id] = short_error(exc)
             print(f"Interest retry failed for {paper_id}: {errors[paper_id]}")
+            continue
+        interested_in, confidence = verdict
+        interest_results[paper_id] = interested_in
+        if confidences is not None:
+            confidences[paper_id] = confidence
+        if on_result is not None:
+            on_result(paper_id, interested_in)
+        print(f"Result for paper {i + 1}: Interested: {interested_in}")
     return interest_results, errors
 
 
 def summarize_sequential_papers(
-    papers: List[dict], existing_summaries: dict
+    papers: List[dict],
+    existing_summaries: dict,
+    on_result: Optional[Callable[[str, object], None]] = None,
 ) -> Tuple[dict, Dict[str, str]]:
-    print("Summarizing papers sequentially...")
+    print("Summarizing papers with individual requests...")
     summaries = dict(existing_summaries)
     errors: Dict[str, str] = {}
-    for i, paper in enumerate(papers):
-        paper_id = paper["paper_id"]
-        if paper_id in summaries:
-            continue
+    pending = [paper for paper in papers if paper["paper_id"] not in summaries]
+    template = summary_request_template
+    config = prompt_config(SUMMARY_MODEL, template.prompt, template.config) if pending else {}
 
-        title = f"\nTitle: {paper['title']}\n"
-        abstract = f"\nAbstract: {paper['summary']}\n"
-        try:
-            response = client_genai.models.generate_content(
-                model=SUMMARY_MODEL,
-                contents=title + abstract + prompt_summarize,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": Summary,
-                    "thinking_config": {"thinking_level": "low"},
-                },
-            )
-            summary = Summary.model_validate_json(response.text)
-            summaries[paper_id] = {
-                "title": summary.title,
-                "summary": summary.summary,
-                "keywords": summary.keywords,
-                "appendix": summary.appendix,
-            }
-            print(f"Result for paper {i + 1}: summarized {paper_id}")
-        except Exception as exc:
+    def summarize(paper: dict) -> dict:
+        response = gemini_generate_content(
+            model=SUMMARY_MODEL, contents=template.contents([paper]), config=config
+        )
+        record_token_usage("summary", response)
+        return template.parse(response.text)
+
+    for i, paper, summary, exc in run_gemini_tasks(pending, summarize):
+        paper_id = paper["paper_id"]
+        if exc is not None:
             errors[paper_id] = short_error(exc)
             print(f"Summary retry failed for {paper_id}: {errors[paper_id]}")
+            continue
+        summaries[paper_id] = summary
+        if on_result is not None:
+            on_result(paper_id, summary)
+        print(f"Result for paper {i + 1}: summarized {paper_id}")
     return summaries, errors
 
 
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Unit-length embeddings of `texts`, requested in chunks of EMBEDDING_BATCH_SIZE."""
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        chunk = texts[start : start + EMBEDDING_BATCH_SIZE]
+        response = call_gemini(
+            lambda: client_genai.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=chunk,
+                config={"task_type": "SEMANTIC_SIMILARITY", "output_dimensionality": EMBEDDING_DIMENSIONS},
+            ),
+            sum(len(text) // 4 for text in chunk),
+        )
+        vectors.extend(embedding.values for embedding in response.embeddings)
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(texts), EMBEDDING_DIMENSIONS)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def embedding_text(paper: dict) -> str:
+    return f"{paper['title']}\n{paper['summary']}"
+
+
+class EmbeddingIndex:
+    """Abstract embeddings labelled 1 (📖 requested) or 0 (left unread), kept as a NumPy archive.
+
+    The fields listed in the interest prompt are stored as extra positives
+    ("field:<name>") so that the index can rank papers before any reaction.
+    New and relabelled rows go to a small `.delta.npz` archive next to the
+    snapshot; it is folded into the snapshot once it holds more than
+    `EMBEDDING_DELTA_FOLD_ROWS` rows or when rows are removed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.delta_path = f"{os.path.splitext(path)[0]}.delta.npz"
+        self.ids: Optional[List[str]] = None
+        self.vectors = np.zeros((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        self.labels = np.zeros(0, dtype=np.int8)
+        self.changed_ids: set = set()
+        self.needs_fold = False
+        self.dirty = False
+
+    def load(self) -> None:
+        if self.ids is not None:
+            return
+        self.ids = []
+        for path in (self.path, self.delta_path):
+            if not os.path.exists(path):
+                continue
+            with np.load(path) as data:
+                if data["vectors"].shape[1:] != (EMBEDDING_DIMENSIONS,):
+                    print(f"Ignoring {path}: it was built with a different EMBEDDING_DIMENSIONS.")
+                    self.needs_fold = True
+                    continue
+                rows = (data["ids"].tolist(), data["vectors"], data["labels"])
+            if path == self.path:
+                self.ids, self.vectors, self.labels = rows[0], rows[1], rows[2]
+            else:
+                self.apply_rows(*rows)
+                self.changed_ids.update(rows[0])
+
+    def apply_rows(self, ids: List[str], vectors: np.ndarray, labels: np.ndarray) -> None:
+        positions = {key: position for position, key in enumerate(self.ids)}
+        new_positions = []
+        for row, key in enumerate(ids):
+            position = positions.get(key)
+            if position is None:
+                new_positions.append(row)
+            else:
+                self.vectors[position] = vectors[row]
+                self.labels[position] = labels[row]
+        if new_positions:
+            self.vectors = np.vstack([self.vectors, vectors[new_positions]])
+            self.labels = np.concatenate([self.labels, labels[new_positions]])
+            self.ids.extend(ids[row] for row in new_positions)
+
+    def add(self, items: List[Tuple[str, str]], label: int) -> None:
+        """Add (key, text) items with `label`, relabelling keys that are already indexed."""
+        self.load()
+        positions = {key: position for position, key in enumerate(self.ids)}
+        new_items: Dict[str, str] = {}
+        for key, text in items:
+            position = positions.get(key)
+            if position is None:
+                new_items[key] = text
+            elif self.labels[position] != label:
+                self.labels[position] = label
+                self.changed_ids.add(key)
+                self.dirty = True
+        if not new_items:
+            return
+        self.vectors = np.vstack([self.vectors, embed_texts(list(new_items.values()))])
+        self.labels = np.concatenate([self.labels, np.full(len(new_items), label, dtype=np.int8)])
+        self.ids.extend(new_items)
+        self.changed_ids.update(new_items)
+        self.dirty = True
+
+    def add_papers(self, papers: List[dict], label: int) -> None:
+        self.add([(split_arxiv_id(paper["paper_id"])[0], embedding_text(paper)) for paper in papers], label)
+
+    def sync_fields(self, phrases: List[str]) -> None:
+        self.load()
+        wanted = {f"field:{phrase}" for phrase in phrases}
+        stale = [
+            position
+            for position, key in enumerate(self.ids)
+            if key.startswith("field:") and key not in wanted
+        ]
+        if stale:
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[stale] = False
+            self.ids = [key for key, kept in zip(self.ids, keep) if kept]
+            self.vectors = self.vectors[keep]
+            self.labels = self.labels[keep]
+            self.needs_fold = self.dirty = True
+        self.add([(f"field:{phrase}", phrase) for phrase in phrases], 1)
+
+    def score(self, papers: List[dict]) -> Dict[str, Tuple[float, float]]:
+        """Return {paper_id: (positive, negative)} mean similarity to the nearest labelled neighbours."""
+        self.load()
+        if not papers:
+            return {}
+        similarities = embed_texts([embedding_text(paper) for paper in papers]) @ self.vectors.T
+
+        def nearest_mean(mask: np.ndarray) -> np.ndarray:
+            if not mask.any():
+                return np.zeros(len(papers), dtype=np.float32)
+            selected = similarities[:, mask]
+            k = min(EMBEDDING_NEIGHBORS, selected.shape[1])
+            return np.partition(selected, -k, axis=1)[:, -k:].mean(axis=1)
+
+        positive = nearest_mean(self.labels == 1)
+        negative = nearest_mean(self.labels == 0)
+        return {
+            paper["paper_id"]: (float(positive[i]), float(negative[i])) for i, paper in enumerate(papers)
+        }
+
+    def save(self) -> None:
+        if not self.dirty or self.ids is None:
+            return
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        if self.needs_fold or len(self.changed_ids) > EMBEDDING_DELTA_FOLD_ROWS:
+            self.write_archive(self.path, list(range(len(self.ids))))
+            if os.path.exists(self.delta_path):
+                os.remove(self.delta_path)
+            self.changed_ids = set()
+            self.needs_fold = False
+        else:
+            rows = [position for position, key in enumerate(self.ids) if key in self.changed_ids]
+            self.write_archive(self.delta_path, rows)
+        self.dirty = False
+
+    def write_archive(self, path: str, rows: List[int]) -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                ids=np.array([self.ids[row] for row in rows], dtype=str),
+                vectors=self.vectors[rows].reshape(len(rows), EMBEDDING_DIMENSIONS),
+                labels=self.labels[rows],
+            )
+        os.replace(temp_path, path)
+
+
+_embedding_index = None
+
+
+def get_embedding_index() -> EmbeddingIndex:
+    global _embedding_index
+    if _embedding_index is None:
+        _embedding_index = EmbeddingIndex(EMBEDDING_INDEX_PATH)
+    return _embedding_index
+
+
+def check_interest_embedding_papers(
+    papers: List[dict],
+    existing_results: Optional[Dict[str, bool]] = None,
+    on_result: Optional[Callable[[str, object], None]] = None,
+    scores: Optional[Dict[str, float]] = None,
+) -> Tuple[Dict[str, bool], Dict[str, str]]:
+    """Drop-in for check_interest_sequential_papers that asks the embedding index instead.
+
+    A paper is interesting when its nearest positives are similar enough and
+    closer than its nearest negatives; `scores` receives positive - negative
+    for ranking.
+    """
+    print("Checking interest with the embedding index...")
+    interest_results = dict(existing_results or {})
+    pending = [paper for paper in papers if paper["paper_id"] not in interest_results]
+    if not pending:
+        return interest_results, {}
+    index = get_embedding_index()
+    try:
+        index.sync_fields(interest_field_phrases(prompt_check_interest))
+        similarities = index.score(pending)
+    except Exception as exc:
+        message = short_error(exc)
+        print(f"Embedding interest check failed: {message}")
+        return interest_results, {paper["paper_id"]: message for paper in pending}
+
+    for paper_id, (positive, negative) in similarities.items():
+        interested_in = positive >= EMBEDDING_MIN_SIMILARITY and positive > negative
+        interest_results[paper_id] = interested_in
+        if scores is not None:
+            scores[paper_id] = round(positive - negative, 4)
+        if on_result is not None:
+            on_result(paper_id, interested_in)
+    interested_count = sum(interest_results[paper["paper_id"]] for paper in pending)
+    print(f"Embedding index marked {interested_count} of {len(pending)} paper(s) as interesting.")
+    return interest_results, {}
+
+
+def learn_interest_feedback(papers: List[dict], label: int) -> None:
+    """Record 📖 requests (1) or papers left unread (0) in the embedding index."""
+    if INTEREST_ENGINE != "embedding" or not papers:
+        return
+    try:
+        get_embedding_index().add_papers(papers, label)
+    except Exception as exc:
+        print(f"Failed to update the embedding index: {short_error(exc)}")
+
+
 def pdf_url_for_paper(paper: dict) -> str:
     pdf_url = paper.get("pdf_url") or paper.get("entry_id", "").replace("/abs/", "/pdf/")
     return pdf_url.replace("http://arxiv.org/", "https://arxiv.org/", 1)
@@ -355,7 +2447,7 @@ def download_pdf(paper: dict) -> bytes:
     if not pdf_url:
         raise ValueError("paper PDF URL is missing")
 
-    response = requests.get(
+    response = http_session(pdf_url).get(
         pdf_url,
         headers={"User-Agent": "discord-arxiv-bot/reading-memo"},
         stream=True,
@@ -387,18 +2479,20 @@ def generate_reading_memo(paper: dict) -> dict:
         config={"mime_type": "application/pdf"},
     )
     try:
-        response = client_genai.models.generate_content(
+        response = gemini_generate_content(
             model=READING_MODEL,
-            contents=[
-                uploaded_file,
-                f"Title: {paper['title']}\nURL: {paper['entry_id']}\n\n{prompt_reading_memo}",
-            ],
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": ReadingMemo,
-                "thinking_config": {"thinking_level": "medium"},
-            },
+            contents=[uploaded_file, f"Title: {paper['title']}\nURL: {paper['entry_id']}\n"],
+            config=prompt_config(
+                READING_MODEL,
+                prompt_reading_memo,
+                {
+                    "response_mime_type": "application/json",
+                    "response_schema": ReadingMemo,
+                    "thinking_config": {"thinking_level": "medium"},
+                },
+            ),
         )
+        record_token_usage("reading", response)
         return ReadingMemo.model_validate_json(response.text).model_dump()
     finally:
         try:
@@ -407,57 +2501,148 @@ def generate_reading_memo(paper: dict) -> dict:
             print(f"Failed to delete temporary Gemini file: {short_error(exc)}")
 
 
-def extract_interest_check(batch_job, papers: List[dict]) -> Tuple[Dict[str, bool], Dict[str, str]]:
-    interest_results: Dict[str, bool] = {}
+def parse_batch_result_lines(lines):
+    """Yield (key, response, error) for the JSONL lines of a batch result file."""
+    for line in lines:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if item.get("response") is None:
+            yield item.get("key"), None, short_error(item.get("error") or "missing batch response")
+            continue
+        try:
+            response = genai_types.GenerateContentResponse.model_validate(item["response"])
+        except Exception as exc:
+            yield item.get("key"), None, short_error(exc)
+            continue
+        yield item.get("key"), response, None
+
+
+def stream_batch_result_lines(file_name: str):
+    """Yield the lines of a batch result file as they are downloaded.
+
+    `client_genai.files.download` returns the whole file as bytes, so the
+    download endpoint is read directly with a streamed GET.
+    """
+    name = file_name[len("files/"):] if file_name.startswith("files/") else file_name
+    url = f"{GEMINI_API_BASE_URL}/files/{name}:download"
+    with http_session(url).get(
+        url,
+        params={"alt": "media"},
+        headers={"x-goog-api-key": os.getenv("GEMINI_API_KEY", "")},
+        stream=True,
+        timeout=(DISCORD_CONNECT_TIMEOUT_SECONDS, 300),
+    ) as response:
+        response.raise_for_status()
+        yield from response.iter_lines()
+
+
+def iter_batch_responses(batch_job, keys: List[str]):
+    """Yield (key, response, error) for each batch item, reading a result file line by line."""
+    dest = getattr(batch_job, "dest", None)
+    file_name = getattr(dest, "file_name", None)
+    if file_name:
+        yield from parse_batch_result_lines(stream_batch_result_lines(file_name))
+        return
+
+    # inline batches submitted before every batch became file-sourced; their responses carry no key
+    inline_responses = getattr(dest, "inlined_responses", None) or []
+    if len(inline_responses) != len(keys):
+        print(f"Ignoring {len(inline_responses)} inline batch response(s) for {len(keys)} request(s).")
+        return
+    for key, inline_response in zip(keys, inline_responses):
+        error = inline_response.error
+        if inline_response.response is None:
+            message = error.message if error and error.message else "missing batch response"
+            yield key, None, short_error(message)
+            continue
+        yield key, inline_response.response, None
+
+
+def extract_batch_results(
+    batch_job, template: BatchRequestTemplate, papers: List[dict]
+) -> Tuple[dict, Dict[str, str]]:
+    units = {template.key(unit): unit for unit in template.units(papers)}
+    results: dict = {}
     errors: Dict[str, str] = {}
-    inline_responses = getattr(getattr(batch_job, "dest", None), "inlined_responses", None) or []
-    for i, paper in enumerate(papers):
-        paper_id = paper["paper_id"]
-        if i >= len(inline_responses):
-            errors[paper_id] = "missing batch response"
+    for key, response, error in iter_batch_responses(batch_job, list(units)):
+        unit = [paper for paper in units.get(key, []) if paper["paper_id"] not in results]
+        if not unit:
             continue
 
-        inline_response = inline_responses[i]
-        response = getattr(inline_response, "response", None)
         if response is None:
-            errors[paper_id] = short_error(getattr(inline_response, "error", "missing batch response"))
+            errors.update((paper["paper_id"], error) for paper in unit)
             continue
 
+        record_token_usage(template.kind, response)
         try:
-            is_interest = InterestCheck.model_validate_json(response.text)
-            interest_results[paper_id] = is_interest.interested_in
+            unit_results, unit_errors = template.parse_unit(response.text, unit)
         except Exception as exc:
-            errors[paper_id] = short_error(exc)
-    return interest_results, errors
+            unit_results, unit_errors = {}, {paper["paper_id"]: short_error(exc) for paper in unit}
+        results.update(unit_results)
+        for paper_id in unit_results:
+            errors.pop(paper_id, None)
+        errors.update(unit_errors)
+    for paper in papers:
+        if paper["paper_id"] not in results and paper["paper_id"] not in errors:
+            errors[paper["paper_id"]] = "missing batch response"
+    return results, errors
+
+
+def extract_interest_check(
+    batch_job, papers: List[dict], pack_size: int = 1, confidences: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, bool], Dict[str, str]]:
+    verdicts, errors = extract_batch_results(batch_job, interest_request_template(pack_size), papers)
+    if confidences is not None:
+        confidences.update((paper_id, confidence) for paper_id, (_, confidence) in verdicts.items())
+    return {paper_id: interested_in for paper_id, (interested_in, _) in verdicts.items()}, errors
 
 
 def extract_summaries(batch_job, papers: List[dict]) -> Tuple[dict, Dict[str, str]]:
-    summaries = {}
-    errors: Dict[str, str] = {}
-    inline_responses = getattr(getattr(batch_job, "dest", None), "inlined_responses", None) or []
-    for i, paper in enumerate(papers):
-        paper_id = paper["paper_id"]
-        if i >= len(inline_responses):
-            errors[paper_id] = "missing batch response"
-            continue
+    return extract_batch_results(batch_job, summary_request_template, papers)
+
+
+def resubmit_failed_batch_items(job: dict, kind: str, papers: List[dict], errors: Dict[str, str]) -> bool:
+    """Submit the failed items of a finished batch as a smaller follow-up batch.
+
+    Returns False when there are too few items or no rounds left; those go to individual requests instead.
+    """
+    retry_papers = [paper for paper in papers if paper["paper_id"] in errors]
+    rounds = int(job.get(f"{kind}_batch_retries", 0))
+    if len(retry_papers) < BATCH_RETRY_MIN_ITEMS or rounds >= BATCH_RETRY_MAX_ROUNDS:
+        return False
 
-        inline_response = inline_responses[i]
-        response = getattr(inline_response, "response", None)
-        if response is None:
-            errors[paper_id] = short_error(getattr(inline_response, "error", "missing batch response"))
-            continue
+    if kind == "interest":
+        model = interest_tier_model(int(job.get("interest_tier", 1)))
+        submit, name_field, ids_field, status = (
+            lambda papers: submit_interest_batch(papers, model),
+            "interest_job_name",
+            "interest_batch_paper_ids",
+            "interest_submitted",
+        )
+    else:
+        model = SUMMARY_MODEL
+        submit, name_field, ids_field, status = (
+            submit_summary_batch, "summarize_job_name", "summary_batch_paper_ids", "summarize_submitted"
+        )
+    try:
+        job_name = submit(retry_papers)
+    except Exception as exc:
+        print(f"Follow-up {kind} batch submission failed: {short_error(exc)}")
+        return False
 
-        try:
-            summary = Summary.model_validate_json(response.text)
-            summaries[paper_id] = {
-                "title": summary.title,
-                "summary": summary.summary,
-                "keywords": summary.keywords,
-                "appendix": summary.appendix,
-            }
-        except Exception as exc:
-            errors[paper_id] = short_error(exc)
-    return summaries, errors
+    job[name_field] = job_name
+    job[ids_field] = [paper["paper_id"] for paper in retry_papers]
+    job[f"{kind}_batch_retries"] = rounds + 1
+    if kind == "interest":
+        job["interest_pack_size"] = INTEREST_PACK_SIZE
+    job[f"{kind}_batch_submitted_at"] = now_iso_utc()
+    start_batch_clock(job, model, len(retry_papers))
+    job["status"] = status
+    job["last_error"] = format_item_errors(f"{kind} batch item failed, resubmitted", errors)
+    mark_job_updated(job)
+    print(f"Resubmitted {len(retry_papers)} failed {kind} item(s) for {job['pipeline_id']}.")
+    return True
 
 
 def truncate_discord_text(value: object, limit: int, fallback: str = "（なし）") -> str:
@@ -495,15 +2680,256 @@ def fit_discord_embed_total_limit(embed: dict) -> None:
             return
 
 
-def discord_retry_delay(response, attempt: int) -> float:
-    if response is not None and response.status_code == 429:
+_http_local = threading.local()
+
+
+class ConnectCounter:
+    """Counts socket connects on the current thread; requests without one reused a kept-alive socket."""
+
+    def connect(self):
+        super().connect()
+        _http_local.connects = getattr(_http_local, "connects", 0) + 1
+
+
+class CountingHTTPConnection(ConnectCounter, HTTPConnection):
+    pass
+
+
+class CountingHTTPSConnection(ConnectCounter, HTTPSConnection):
+    pass
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CountingHTTPConnection
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CountingHTTPSConnection
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """Pooled adapter that records requests, new connections and latency per host."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        connects_before = getattr(_http_local, "connects", 0)
+        started = time.monotonic()
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            new_connections = getattr(_http_local, "connects", 0) - connects_before
+            record_http_request(urlparse(request.url).netloc, new_connections, time.monotonic() - started)
+
+
+_http_sessions: Dict[str, requests.Session] = {}
+_http_stats: Dict[str, Dict[str, float]] = {}
+_http_lock = threading.Lock()
+
+
+def http_session(url: str, retry_total: int = HTTP_RETRY_TOTAL) -> requests.Session:
+    """Shared keep-alive session for the host of `url`.
+
+    `retry_total` only applies when the host's session is first created.
+    """
+    host = urlparse(url).netloc
+    with _http_lock:
+        session = _http_sessions.get(host)
+        if session is None:
+            retries = Retry(
+                total=retry_total,
+                backoff_factor=0.5,
+                allowed_methods=HTTP_RETRY_METHODS,
+                status_forcelist=(),
+                raise_on_status=False,
+            )
+            adapter = InstrumentedHTTPAdapter(
+                pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retries
+            )
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_sessions[host] = session
+        return session
+
+
+def record_http_request(host: str, new_connections: int, seconds: float) -> None:
+    with _http_lock:
+        stats = _http_stats.setdefault(host, {"requests": 0, "new_connections": 0, "seconds": 0.0})
+        stats["requests"] += 1
+        stats["new_connections"] += max(0, new_connections)
+        stats["seconds"] += seconds
+
+
+def log_http_stats() -> None:
+    with _http_lock:
+        for host, stats in sorted(_http_stats.items()):
+            reused = max(0, stats["requests"] - stats["new_connections"])
+            average_ms = 1000 * stats["seconds"] / stats["requests"]
+            print(
+                f"HTTP {host}: {stats['requests']} request(s), {reused} on a reused connection, "
+                f"{average_ms:.0f} ms average"
+            )
+
+
+def discord_route(method: str, url: str) -> Tuple[str, str]:
+    """Return the rate-limit route of a Discord URL and its major parameter.
+
+    IDs other than the channel/guild/webhook one (and the webhook token) are
+    replaced by placeholders, so messages in one channel share a route.
+    """
+    segments = urlparse(url).path.split("/")
+    route: List[str] = []
+    major: List[str] = []
+    for index, segment in enumerate(segments):
+        previous = segments[index - 1] if index > 0 else ""
+        before_previous = segments[index - 2] if index > 1 else ""
+        if previous in ("channels", "guilds", "webhooks") or before_previous == "webhooks":
+            major.append(segment)
+            route.append(segment)
+        elif previous == "reactions":
+            route.append(":emoji")
+        elif segment.isdigit():
+            route.append(":id")
+        else:
+            route.append(segment)
+    return f"{method.upper()} {'/'.join(route)}", "/".join(major)
+
+
+class DiscordRateLimiter:
+    """Per-bucket rate limits learned from Discord's `X-RateLimit-*` headers.
+
+    Routes are mapped to the bucket reported by Discord; a bucket with no
+    requests left blocks only its own routes until it resets.  Until a route's
+    bucket is known, its requests go out one at a time.  A global 429 blocks
+    every route.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.route_buckets: Dict[str, str] = {}
+        self.buckets: Dict[str, dict] = {}
+        self.probing: set = set()
+        self.global_reset_at = 0.0
+
+    def bucket_key(self, route: str, major: str) -> Optional[str]:
+        bucket = self.route_buckets.get(route)
+        return f"{bucket}:{major}" if bucket else None
+
+    def acquire(self, route: str, major: str) -> None:
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                wait = self.global_reset_at - now
+                key = self.bucket_key(route, major)
+                bucket = self.buckets.get(key) if key else None
+                if bucket is not None and bucket["reset_at"] <= now:
+                    # start the next window here so the refill cannot repeat until update() corrects it
+                    bucket["remaining"] = bucket["limit"]
+                    bucket["reset_at"] = now + bucket["window"]
+                if key is None and route in self.probing:
+                    wait = max(wait, DISCORD_READ_TIMEOUT_SECONDS)
+                elif bucket is not None and bucket["remaining"] <= 0:
+                    wait = max(wait, bucket["reset_at"] - now)
+                if wait <= 0:
+                    if bucket is not None:
+                        bucket["remaining"] -= 1
+                    elif key is None:
+                        self.probing.add(route)
+                    return
+                # woken early when a response updates the limits
+                self.condition.wait(min(wait, DISCORD_MAX_RATE_LIMIT_WAIT_SECONDS))
+
+    def wait_seconds(self, route: str, major: str) -> float:
+        """Seconds acquire() would wait for the global limit or an exhausted bucket."""
+        with self.condition:
+            now = time.monotonic()
+            wait = self.global_reset_at - now
+            key = self.bucket_key(route, major)
+            bucket = self.buckets.get(key) if key else None
+            if bucket is not None and bucket["remaining"] <= 0:
+                wait = max(wait, bucket["reset_at"] - now)
+            return max(wait, 0.0)
+
+    def update(self, route: str, major: str, response) -> None:
+        headers = response.headers if response is not None else {}
+        now = time.monotonic()
+        with self.condition:
+            self.probing.discard(route)
+            bucket_hash = headers.get("X-RateLimit-Bucket")
+            if bucket_hash:
+                self.route_buckets[route] = bucket_hash
+                key = f"{bucket_hash}:{major}"
+                try:
+                    reset_after = float(headers.get("X-RateLimit-Reset-After", 0))
+                    self.buckets[key] = {
+                        "limit": int(headers.get("X-RateLimit-Limit", 1)),
+                        "remaining": int(headers.get("X-RateLimit-Remaining", 1)),
+                        "reset_at": now + reset_after,
+                        # the longest reset seen is the closest guess of the full window
+                        "window": max(reset_after, self.buckets.get(key, {}).get("window", 0.0)),
+                    }
+                except (TypeError, ValueError):
+                    pass
+            if response is not None and response.status_code == 429:
+                retry_after, is_global = discord_retry_after(response)
+                if is_global:
+                    self.global_reset_at = max(self.global_reset_at, now + retry_after)
+                else:
+                    key = self.bucket_key(route, major)
+                    if key and key in self.buckets:
+                        self.buckets[key]["remaining"] = 0
+                        self.buckets[key]["reset_at"] = max(self.buckets[key]["reset_at"], now + retry_after)
+            self.condition.notify_all()
+
+
+discord_rate_limiter = DiscordRateLimiter()
+
+
+def discord_retry_after(response) -> Tuple[float, bool]:
+    """Seconds to wait after a 429 and whether the limit is global."""
+    is_global = response.headers.get("X-RateLimit-Global", "").lower() == "true"
+    retry_after = 0.0
+    try:
+        body = response.json()
+        retry_after = float(body.get("retry_after", 0))
+        is_global = is_global or bool(body.get("global", False))
+    except (TypeError, ValueError, AttributeError, json.JSONDecodeError):
         try:
-            retry_after = float(response.json().get("retry_after", 0))
-            if retry_after > 0:
-                return min(retry_after, 30.0)
-        except (TypeError, ValueError, AttributeError, json.JSONDecodeError):
+            retry_after = float(response.headers.get("Retry-After", 0))
+        except (TypeError, ValueError):
             pass
-    return DISCORD_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+    return min(max(retry_after, 0.0), DISCORD_MAX_RATE_LIMIT_WAIT_SECONDS), is_global
+
+
+def discord_rate_limited_request(method: str, url: str, **kwargs):
+    """Send a Discord request once its rate-limit bucket allows it."""
+    route, major = discord_route(method, url)
+    discord_rate_limiter.acquire(route, major)
+    response = None
+    try:
+        # the caller's DISCORD_MAX_ATTEMPTS loop is the only retry layer, so each attempt updates the limits
+        response = http_session(url, retry_total=0).request(method, url, **kwargs)
+        return response
+    finally:
+        discord_rate_limiter.update(route, major, response)
+
+
+def discord_retry_delay(response, attempt: int) -> float:
+    backoff = DISCORD_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+    if response is None or response.status_code != 429:
+        return backoff
+    # the rate limiter waits out a 429 it could attach to the global limit or a known bucket
+    if discord_rate_limiter.wait_seconds(*discord_route(response.request.method, response.request.url)) > 0:
+        return 0.0
+    retry_after, _ = discord_retry_after(response)
+    return retry_after or backoff
 
 
 def post_discord_payload(
@@ -512,7 +2938,8 @@ def post_discord_payload(
     for attempt in range(1, DISCORD_MAX_ATTEMPTS + 1):
         response = None
         try:
-            response = requests.post(
+            response = discord_rate_limited_request(
+                "POST",
                 webhook_url,
                 json=payload,
                 params={"wait": "true"} if wait else None,
@@ -542,7 +2969,9 @@ def post_discord_payload(
     return False
 
 
-def post_summary_to_discord(webhook_url: str, paper: dict, summary: dict) -> Optional[dict]:
+def build_summary_embed(paper: dict, summary: dict, slot: Optional[int] = None) -> dict:
+    """Embed for one paper; in a digest the title starts with the keycap of its `slot`."""
+    title = summary["title"] if slot is None else f"{KEYCAP_EMOJIS[slot - 1]} {summary['title']}"
     authors = truncate_discord_text(", ".join(paper["authors"]), DISCORD_EMBED_FIELD_VALUE_LIMIT)
     embed = {
         "author": {
@@ -550,7 +2979,7 @@ def post_summary_to_discord(webhook_url: str, paper: dict, summary: dict) -> Opt
             "url": "https://arxiv.org/",
             "icon_url": "https://shuyaojiang.github.io/assets/images/badges/arXiv.png",
         },
-        "title": truncate_discord_text(summary["title"], DISCORD_EMBED_TITLE_LIMIT),
+        "title": truncate_discord_text(title, DISCORD_EMBED_TITLE_LIMIT),
         "url": paper["entry_id"],
         "color": 0xE12D2D,
         "timestamp": datetime.datetime.now(ZoneInfo("Asia/Tokyo")).isoformat(),
@@ -593,8 +3022,11 @@ def post_summary_to_discord(webhook_url: str, paper: dict, summary: dict) -> Opt
         }
     )
     fit_discord_embed_total_limit(embed)
+    return embed
+
 
-    message = {"embeds": [embed]}
+def post_summary_to_discord(webhook_url: str, paper: dict, summary: dict) -> Optional[dict]:
+    message = {"embeds": [build_summary_embed(paper, summary)]}
     result = post_discord_payload(webhook_url, message, f"paper {paper['paper_id']}", wait=True)
     if isinstance(result, dict) and result.get("id") and result.get("channel_id"):
         print(f"Sent paper: {paper['title']}")
@@ -603,6 +3035,65 @@ def post_summary_to_discord(webhook_url: str, paper: dict, summary: dict) -> Opt
     return None
 
 
+def group_summary_digests(items: List[Tuple[dict, dict]]) -> List[List[Tuple[str, dict]]]:
+    """Pack (paper, summary) pairs into messages of at most DISCORD_DIGEST_SIZE embeds.
+
+    The embeds of one message stay within DISCORD_EMBED_TOTAL_LIMIT together.
+    """
+    groups: List[List[Tuple[str, dict]]] = []
+    current: List[Tuple[str, dict]] = []
+    total = 0
+    for paper, summary in items:
+        if len(current) >= DISCORD_DIGEST_SIZE:
+            groups.append(current)
+            current, total = [], 0
+        embed = build_summary_embed(paper, summary, len(current) + 1)
+        length = discord_embed_text_length(embed)
+        if current and total + length > DISCORD_EMBED_TOTAL_LIMIT:
+            groups.append(current)
+            current, total = [], 0
+            embed = build_summary_embed(paper, summary, 1)
+            length = discord_embed_text_length(embed)
+        current.append((paper["paper_id"], embed))
+        total += length
+    if current:
+        groups.append(current)
+    return groups
+
+
+def post_summary_digests(webhook_url: str, job: dict, items: List[Tuple[dict, dict]]) -> bool:
+    """Post digest messages and map each paper to its (message, slot); returns False if one failed."""
+    all_success = True
+    for group in group_summary_digests(items):
+        message = post_discord_payload(
+            webhook_url,
+            {
+                "content": "全文メモが欲しい論文には, 番号のリアクションを付けてください",
+                "embeds": [embed for _, embed in group],
+            },
+            f"digest of {len(group)} paper(s)",
+            wait=True,
+        )
+        if not (isinstance(message, dict) and message.get("id") and message.get("channel_id")):
+            all_success = False
+            continue
+        for slot, (paper_id, _) in enumerate(group, start=1):
+            message_state = {
+                "message_id": message["id"],
+                "channel_id": message["channel_id"],
+                "slot": slot,
+                # readers add the keycap themselves, so there is no reaction for the bot to add
+                "reaction_added": True,
+                "read_requested": False,
+                "reading_memo_sent": False,
+                "paper_thread_id": None,
+            }
+            job["discord_messages"][paper_id] = message_state
+            append_state_journal(job["pipeline_id"], "discord_messages", paper_id, message_state)
+        print(f"Sent digest of {len(group)} paper(s).")
+    return all_success
+
+
 def discord_bot_request(
     method: str,
     path: str,
@@ -621,7 +3112,7 @@ def discord_bot_request(
     for attempt in range(1, max_attempts + 1):
         response = None
         try:
-            response = requests.request(
+            response = discord_rate_limited_request(
                 method,
                 f"{DISCORD_API_BASE_URL}{path}",
                 headers={"Authorization": f"Bot {token}"},
@@ -667,19 +3158,125 @@ def reaction_users_include_request(users: List[dict], discord_user_id: str = "")
     return bool(people)
 
 
+def discord_message_time(message_id: object) -> Optional[datetime.datetime]:
+    """Creation time encoded in a Discord snowflake ID."""
+    try:
+        milliseconds = (int(message_id) >> 22) + DISCORD_EPOCH_MS
+    except (TypeError, ValueError):
+        return None
+    return datetime.datetime.fromtimestamp(milliseconds / 1000, ZoneInfo("UTC"))
+
+
+def reaction_check_cutoff() -> str:
+    cutoff = datetime.datetime.now(ZoneInfo("UTC")) + datetime.timedelta(minutes=READING_CHECK_SLACK_MINUTES)
+    return cutoff.isoformat(timespec="seconds")
+
+
+def next_reaction_check_at(message_state: dict) -> str:
+    """Next time to look for a reading request; READING_CHECK_NEVER past the horizon."""
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    posted_at = discord_message_time(message_state.get("message_id")) or now
+    age_days = (now - posted_at).total_seconds() / 86400
+    if age_days >= READING_CHECK_HORIZON_DAYS:
+        return READING_CHECK_NEVER
+    interval = next(minutes for max_age, minutes in READING_CHECK_SCHEDULE if age_days < max_age)
+    return (now + datetime.timedelta(minutes=interval)).isoformat(timespec="seconds")
+
+
+def is_reaction_check_due(message_state: dict) -> bool:
+    next_check_at = message_state.get("next_check_at")
+    return not next_check_at or next_check_at <= reaction_check_cutoff()
+
+
+def read_request_emoji(message_state: dict) -> str:
+    slot = message_state.get("slot")
+    return KEYCAP_EMOJIS[slot - 1] if slot else READ_EMOJI
+
+
 def has_read_request(
-    bot_token: str, channel_id: str, message_id: str, discord_user_id: str = ""
+    bot_token: str, channel_id: str, message_id: str, discord_user_id: str = "", emoji: str = READ_EMOJI
 ) -> bool:
     users = discord_bot_request(
         "GET",
-        f"/channels/{channel_id}/messages/{message_id}/reactions/{quote(READ_EMOJI)}",
+        f"/channels/{channel_id}/messages/{message_id}/reactions/{quote(emoji)}",
         bot_token,
-        f"get {READ_EMOJI} reactions for message {message_id}",
+        f"get {emoji} reactions for message {message_id}",
         params={"limit": 100},
     )
     return isinstance(users, list) and reaction_users_include_request(users, discord_user_id)
 
 
+def scan_read_request_candidates(
+    bot_token: str, channel_id: str, after: int, wanted: Dict[str, set]
+) -> Optional[set]:
+    """Return (message ID, emoji) pairs of wanted messages that someone other than the bot reacted to.
+
+    Pages through the channel history after message `after`.  `wanted` maps
+    message IDs to the emojis that request a reading memo.
+    The reaction counts included in each message are enough to find the
+    candidates; their users are only fetched afterwards.  Returns None when
+    the history cannot be read.
+    """
+    candidates = set()
+    last_wanted = max(int(message_id) for message_id in wanted)
+    while True:
+        page = discord_bot_request(
+            "GET",
+            f"/channels/{channel_id}/messages",
+            bot_token,
+            f"read message history of channel {channel_id}",
+            params={"after": str(after), "limit": 100},
+        )
+        if not isinstance(page, list):
+            return None
+        for message in page:
+            emojis = wanted.get(str(message.get("id")), set())
+            for reaction in message.get("reactions", []):
+                others = int(reaction.get("count", 0)) - (1 if reaction.get("me") else 0)
+                emoji = (reaction.get("emoji") or {}).get("name")
+                if emoji in emojis and others > 0:
+                    candidates.add((str(message["id"]), emoji))
+        if len(page) < 100:
+            return candidates
+        after = max(int(message["id"]) for message in page)
+        if after >= last_wanted:
+            return candidates
+
+
+def group_wanted_reactions(open_messages: List[dict]) -> Dict[str, Tuple[int, Dict[str, set]]]:
+    """Map each channel to the message ID to scan after and the wanted {message ID: emojis}.
+
+    The scan starts just before the oldest message being checked, so a
+    message that becomes due after newer ones is still covered.
+    """
+    by_channel: Dict[str, Dict[str, set]] = {}
+    for message_state in open_messages:
+        wanted = by_channel.setdefault(message_state["channel_id"], {})
+        wanted.setdefault(message_state["message_id"], set()).add(read_request_emoji(message_state))
+    return {
+        channel_id: (min(int(message_id) for message_id in wanted) - 1, wanted)
+        for channel_id, wanted in by_channel.items()
+    }
+
+
+def find_read_request_candidates(bot_token: str, open_messages: List[dict]) -> set:
+    """Scan each channel once for the messages in `open_messages`.
+
+    Channels whose history cannot be read fall back to checking every
+    message.
+    """
+    candidates = set()
+    for channel_id, (after, wanted) in group_wanted_reactions(open_messages).items():
+        channel_candidates = scan_read_request_candidates(bot_token, channel_id, after, wanted)
+        if channel_candidates is None:
+            print(f"Checking reactions message by message in channel {channel_id}.")
+            channel_candidates = {
+                (message_id, emoji) for message_id, emojis in wanted.items() for emoji in emojis
+            }
+        candidates |= channel_candidates
+    return candidates
+
+
 def build_reading_memo_embed(paper: dict, memo: dict) -> dict:
     questions = "\n".join(f"- {question}" for question in memo["follow_up_questions"])
     embed = {
@@ -724,100 +3321,432 @@ def post_reading_memo_to_forum(
     return result if isinstance(result, dict) and result.get("id") else None
 
 
-def run_stage_enqueue_interest() -> int:
-    search_results = list(search_papers())
-    if len(search_results) == 0:
-        print("No papers found, exiting.")
-        return 0
-
-    papers = [serialize_paper(paper) for paper in search_results]
-    interest_job_name = submit_interest_batch(papers)
-    if not interest_job_name:
+def enqueue_interest_pipeline(
+    state: dict, builder: InterestBatchBuilder, window: Optional[dict] = None
+) -> Optional[str]:
+    batch_job_name = builder.submit()
+    if builder.batch_papers and not batch_job_name:
         print("Failed to create interest batch job.")
-        return 1
+        return None
 
-    state = load_state()
     now = now_iso_utc()
     pipeline_id = f"{datetime.datetime.now(ZoneInfo('UTC')).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:8]}"
-    state["jobs"].append(
-        {
-            "pipeline_id": pipeline_id,
-            "status": "interest_submitted",
-            "interest_job_name": interest_job_name,
-            "summarize_job_name": None,
-            "papers": papers,
-            "interest_results": {},
-            "interested_paper_ids": [],
-            "summaries": {},
-            "sent_paper_ids": [],
-            "discord_messages": {},
-            "reading_memos": {},
-            "notification_sent": False,
-            "retry_count": 0,
-            "last_error": None,
-            "created_at": now,
-            "updated_at": now,
-            "finalized_at": None,
-        }
-    )
-    save_state(state)
+    job = {
+        "pipeline_id": pipeline_id,
+        "status": "fused_submitted" if builder.fused else "interest_submitted",
+        "interest_job_name": "" if builder.fused else batch_job_name,
+        "fused_job_name": batch_job_name if builder.fused else None,
+        "summarize_job_name": None,
+        "paper_ids": [],
+        "interest_batch_paper_ids": [paper["paper_id"] for paper in builder.batch_papers],
+        "interest_pack_size": INTEREST_PACK_SIZE,
+        "prefilter_scores": builder.prefilter_scores,
+        "interest_scores": builder.interest_scores,
+        "interest_results": dict(builder.cached_results),
+        "interested_paper_ids": [],
+        "summaries": {},
+        "sent_paper_ids": [],
+        "discord_messages": {},
+        "reading_memos": {},
+        "notification_sent": False,
+        "retry_count": 0,
+        "last_error": None,
+        "harvest_window": window,
+        "created_at": now,
+        "updated_at": now,
+        "finalized_at": None,
+    }
+    if batch_job_name:
+        start_batch_clock(job, SUMMARY_MODEL if builder.fused else INTEREST_MODEL, len(builder.batch_papers))
+    store_job_papers(job, builder.papers)
+    state["jobs"].append(job)
     print(f"Queued pipeline: {pipeline_id}")
+    return pipeline_id
+
+
+def fetch_window_papers(
+    progress: dict, start: datetime.datetime, end: datetime.datetime, on_paper: Callable[[dict], None]
+) -> bool:
+    """Fetch one harvest window, passing each new paper to `on_paper`.
+
+    `progress` holds the resume cursor (`state["harvest"]` or
+    `state["backfill"]`).  On failure the cursor is stored there and False is
+    returned; the caller must save the state.
+    """
+    window = {"start": start.isoformat(), "end": end.isoformat()}
+    cursor = progress.pop("cursor", None) or {}
+    queries = arxiv_category_queries()
+    offsets: Dict[str, int] = {}
+    completed = set()
+    fetched: List[dict] = []
+    if cursor.get("window") == window and cursor.get("queries") == queries:
+        offsets = dict(cursor.get("offsets", {}))
+        completed = set(cursor.get("completed_queries", []))
+        fetched = get_papers(cursor.get("paper_ids", []))
+        for paper in fetched:
+            on_paper(paper)
+        print(f"Resuming arXiv fetch with {len(fetched)} paper(s) already fetched.")
+
+    # cross-listed papers are returned by several category queries
+    seen_ids = {paper["entry_id"] for paper in fetched}
+    errors: Dict[str, str] = {}
+    pending_queries = [query for query in queries if query not in completed]
+    for query, next_offset, page, error in search_papers_parallel(start, end, offsets, pending_queries):
+        if error is not None:
+            errors[query] = short_error(error)
+        elif next_offset is None:
+            completed.add(query)
+        else:
+            offsets[query] = next_offset
+            for paper in page:
+                if paper["entry_id"] not in seen_ids:
+                    seen_ids.add(paper["entry_id"])
+                    fetched.append(paper)
+                    on_paper(paper)
+
+    if errors:
+        print(format_item_errors("arXiv fetch failed", errors))
+        for paper in fetched:
+            get_paper_store().put(paper)
+        progress["cursor"] = {
+            "window": window,
+            "queries": queries,
+            "offsets": offsets,
+            "completed_queries": sorted(completed),
+            "paper_ids": [paper["paper_id"] for paper in fetched],
+        }
+        return False
+    return True
+
+
+def run_stage_enqueue_interest() -> int:
+    state = load_state(statuses=())
+    harvest = dict(state.get("harvest") or {})
+    high_water_mark = parse_iso_datetime(harvest.get("high_water_mark", ""))
+    windows = harvest_windows(high_water_mark, datetime.datetime.now(ZoneInfo("UTC")))
+    if not windows:
+        print("Nothing new to harvest yet.")
+        return 0
+
+    prefilter = get_interest_prefilter()
+    for start, end in windows:
+        window = {"start": start.isoformat(), "end": end.isoformat()}
+        builder = InterestBatchBuilder(prefilter)
+        if not fetch_window_papers(harvest, start, end, builder.add):
+            state["harvest"] = harvest
+            save_state(state)
+            return 1
+
+        papers = builder.papers
+        if len(papers) == 0:
+            print("No papers found in this window.")
+        elif enqueue_interest_pipeline(state, builder, window) is None:
+            save_state(state)
+            return 1
+
+        harvest["high_water_mark"] = end.isoformat()
+        if papers:
+            newest = max(papers, key=lambda paper: paper.get("published") or "")
+            harvest["last_submitted"] = newest.get("published")
+            harvest["last_entry_id"] = newest["entry_id"]
+        state["harvest"] = harvest
+        # keep the mark durable per window so a failure later never re-harvests it
+        save_state(state)
+    return 0
+
+
+def date_range_windows(
+    from_date: datetime.date, to_date: datetime.date
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    start = datetime.datetime.combine(from_date, datetime.time(), ARXIV_TIMEZONE)
+    upper = datetime.datetime.combine(to_date + datetime.timedelta(days=1), datetime.time(), ARXIV_TIMEZONE)
+    step = datetime.timedelta(hours=HARVEST_WINDOW_HOURS)
+    windows = []
+    while start < upper:
+        end = min(start + step, upper)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
+def count_active_batches(state: dict) -> int:
+    count = 0
+    for job in state["jobs"]:
+        status = job.get("status")
+        if status in ("interest_submitted", "interest_running") and job.get("interest_job_name"):
+            count += 1
+        elif status in ("summarize_submitted", "summarize_running") and job.get("summarize_job_name"):
+            count += 1
+        elif status in ("fused_submitted", "fused_running") and job.get("fused_job_name"):
+            count += 1
+    return count
+
+
+def run_stage_backfill(from_value: Optional[str], to_value: Optional[str]) -> int:
+    """Queue a date range and submit its chunks while batch slots are free.
+
+    Without `--from`/`--to` only the remaining queue is processed, so the
+    stage can run on every poll until the backfill is drained.
+    """
+    state = load_state(statuses=INTEREST_ACTIVE_STATUSES + SUMMARY_ACTIVE_STATUSES)
+    backfill = dict(state.get("backfill") or {})
+    backfill.setdefault("windows", [])
+    backfill.setdefault("chunks", [])
+
+    if from_value or to_value:
+        try:
+            from_date = datetime.date.fromisoformat(from_value or to_value)
+            to_date = datetime.date.fromisoformat(to_value or from_value)
+        except ValueError:
+            print("--from/--to must be YYYY-MM-DD.")
+            return 1
+        if from_date > to_date:
+            print("--from must not be after --to.")
+            return 1
+        new_windows = date_range_windows(from_date, to_date)
+        backfill["windows"].extend(
+            {"start": start.isoformat(), "end": end.isoformat()} for start, end in new_windows
+        )
+        print(f"Queued {len(new_windows)} backfill window(s) from {from_date} to {to_date}.")
+        state["backfill"] = backfill
+        save_state(state)
+
+    if not backfill["windows"] and not backfill["chunks"]:
+        print("No backfill queued.")
+        return 0
+
+    free_slots = BACKFILL_MAX_ACTIVE_BATCHES - count_active_batches(state)
+    while free_slots > 0 and (backfill["chunks"] or backfill["windows"]):
+        if backfill["chunks"]:
+            chunk = backfill["chunks"].pop(0)
+            builder = InterestBatchBuilder(get_interest_prefilter())
+            for paper in get_papers(chunk["paper_ids"]):
+                builder.add(paper)
+            if builder.papers and enqueue_interest_pipeline(state, builder, chunk["window"]) is None:
+                backfill["chunks"].insert(0, chunk)
+                state["backfill"] = backfill
+                save_state(state)
+                return 1
+            if builder.batch_papers:
+                free_slots -= 1
+        else:
+            window = backfill["windows"][0]
+            start = parse_iso_datetime(window["start"])
+            end = parse_iso_datetime(window["end"])
+            papers: List[dict] = []
+            if not fetch_window_papers(backfill, start, end, papers.append):
+                state["backfill"] = backfill
+                save_state(state)
+                return 1
+            backfill["windows"].pop(0)
+            store = get_paper_store()
+            chunk_count = 0
+            for i in range(0, len(papers), BACKFILL_CHUNK_SIZE):
+                chunk_papers = papers[i : i + BACKFILL_CHUNK_SIZE]
+                for paper in chunk_papers:
+                    store.put(paper)
+                backfill["chunks"].append(
+                    {"window": window, "paper_ids": [paper["paper_id"] for paper in chunk_papers]}
+                )
+                chunk_count += 1
+            print(f"Backfill window {window['start']}: {len(papers)} paper(s) in {chunk_count} chunk(s).")
+        state["backfill"] = backfill
+        save_state(state)
+
+    remaining = len(backfill["windows"]) + len(backfill["chunks"])
+    if remaining:
+        print(f"Backfill paused at the active batch limit; {remaining} window(s)/chunk(s) left.")
+    else:
+        print("Backfill finished.")
     return 0
 
 
+def select_interested_ids(job: dict, papers: List[dict]) -> List[str]:
+    """Store and return the interested paper IDs once every paper has a verdict."""
+    interest_results = job.get("interest_results", {})
+    interested_ids = [
+        paper["paper_id"] for paper in papers if interest_results.get(paper["paper_id"]) is True
+    ]
+    interest_scores = job.get("interest_scores") or {}
+    if interest_scores:
+        # best-ranked papers are summarized and posted first
+        interested_ids.sort(key=lambda paper_id: interest_scores.get(paper_id, -math.inf), reverse=True)
+    job["interested_paper_ids"] = interested_ids
+    # only verdicts of the model teach the prefilter, never its own accepts
+    prefilter_scores = job.get("prefilter_scores", {})
+    get_interest_profile().add([
+        paper
+        for paper in papers
+        if paper["paper_id"] in interested_ids
+        and prefilter_scores.get(paper["paper_id"], [0, "llm"])[1] != "accept"
+    ])
+    return interested_ids
+
+
+def apply_fused_results(job: dict, batch_job, papers: List[dict]) -> Dict[str, str]:
+    """Copy verdicts and summaries of a finished fused batch into the job and return item errors."""
+    verdicts, errors = extract_batch_results(batch_job, fused_request_template, papers)
+    interest_results = dict(job.get("interest_results", {}))
+    confidences = job.setdefault("interest_confidence", {})
+    summaries: Dict[str, dict] = {}
+    for paper_id, (interested_in, confidence, summary) in verdicts.items():
+        interest_results[paper_id] = interested_in
+        confidences[paper_id] = confidence
+        if summary is not None:
+            summaries[paper_id] = summary
+    job["interest_results"] = interest_results
+    job["summaries"].update(summaries)
+    fused_results = {paper_id: verdict[0] for paper_id, verdict in verdicts.items()}
+    cache_interest_results(job, papers, fused_results, "fused_interest", SUMMARY_MODEL)
+    cache_results("fused_summary", papers, summaries, SUMMARY_MODEL)
+    return errors
+
+
+def cache_interest_results(
+    job: dict,
+    papers: List[dict],
+    results: Dict[str, bool],
+    kind: str = "interest",
+    model: str = INTEREST_MODEL,
+) -> None:
+    """Cache final verdicts of `model` only; its unsure answers are left to the escalation model."""
+    confidences = job.get("interest_confidence", {})
+    if INTEREST_ESCALATION_MODEL and model != INTEREST_ESCALATION_MODEL:
+        results = {
+            paper_id: interested_in
+            for paper_id, interested_in in results.items()
+            if confidences.get(paper_id, 1.0) >= INTEREST_ESCALATION_THRESHOLD
+        }
+    cache_results(kind, papers, results, model)
+
+
+def escalate_low_confidence(job: dict, papers: List[dict]) -> bool:
+    """Send the first-tier verdicts below INTEREST_ESCALATION_THRESHOLD to the stronger model."""
+    if not INTEREST_ESCALATION_MODEL or int(job.get("interest_tier", 1)) >= 2:
+        return False
+    confidences = job.get("interest_confidence", {})
+    unsure_papers = [
+        paper
+        for paper in papers
+        if confidences.get(paper["paper_id"], 1.0) < INTEREST_ESCALATION_THRESHOLD
+    ]
+    if not unsure_papers:
+        return False
+    try:
+        interest_job_name = submit_interest_batch(unsure_papers, INTEREST_ESCALATION_MODEL)
+    except Exception as exc:
+        # the first-tier verdicts are still usable
+        print(f"Escalation batch submission failed: {short_error(exc)}")
+        return False
+
+    job["interest_tier"] = 2
+    job["interest_job_name"] = interest_job_name
+    job["interest_batch_paper_ids"] = [paper["paper_id"] for paper in unsure_papers]
+    job["interest_pack_size"] = INTEREST_PACK_SIZE
+    job["interest_batch_retries"] = 0
+    job["interest_batch_submitted_at"] = now_iso_utc()
+    start_batch_clock(job, INTEREST_ESCALATION_MODEL, len(unsure_papers))
+    job["status"] = "interest_submitted"
+    job["last_error"] = None
+    mark_job_updated(job)
+    print(f"Escalated {len(unsure_papers)} unsure interest verdict(s) to {INTEREST_ESCALATION_MODEL}.")
+    return True
+
+
 def run_stage_poll_interest_submit_summary() -> int:
-    state = load_state()
+    if not is_poll_stage_due("poll_interest_submit_summary"):
+        print("No interest batch is due for polling.")
+        return 0
+    state = load_state(statuses=INTEREST_ACTIVE_STATUSES)
     updated = False
 
     for job in state["jobs"]:
-        if job.get("status") not in ("interest_submitted", "interest_running", "interest_fallback_running"):
+        if job.get("status") not in INTEREST_ACTIVE_STATUSES:
             continue
 
-        papers = job.get("papers", [])
+        papers = get_job_papers(job)
         interest_results = dict(job.get("interest_results", {}))
         job["interest_results"] = interest_results
-        is_timeout = is_older_than_hours(job.get("created_at", ""), BATCH_TIMEOUT_HOURS)
+        timeout_anchor = job.get("interest_batch_submitted_at") or job.get("created_at", "")
+        is_timeout = is_older_than_hours(timeout_anchor, BATCH_TIMEOUT_HOURS)
 
-        if job.get("status") != "interest_fallback_running":
+        if job.get("status") != "interest_fallback_running" and job.get("interest_job_name"):
+            if not is_timeout and not is_batch_poll_due(job):
+                continue
             batch_job = poll_batch_once(job.get("interest_job_name", ""))
             if not batch_job:
                 continue
 
             batch_state = batch_job.state.name
+            if batch_state in COMPLETED_BATCH_STATUS:
+                finish_batch_clock(job, batch_job)
             if batch_state not in COMPLETED_BATCH_STATUS:
                 if is_timeout:
                     cancel_ok = cancel_batch_safely(job.get("interest_job_name", ""))
+                    job.pop("next_poll_at", None)
                     job["status"] = "interest_fallback_running"
                     job["last_error"] = None if cancel_ok else "interest timeout reached, cancel request failed"
                     mark_job_updated(job)
-                    updated = True
-                elif job.get("status") != "interest_running":
-                    job["status"] = "interest_running"
-                    mark_job_updated(job)
-                    updated = True
+                else:
+                    schedule_batch_poll(job)
+                    if job.get("status") != "interest_running":
+                        job["status"] = "interest_running"
+                        mark_job_updated(job)
+                updated = True
                 if not is_timeout:
                     continue
 
             elif batch_state != "JOB_STATE_SUCCEEDED":
+                batch_papers = get_job_papers(job, job.get("interest_batch_paper_ids", job.get("paper_ids")))
+                batch_errors = {
+                    paper["paper_id"]: f"interest batch ended with {batch_state}" for paper in batch_papers
+                }
+                updated = True
+                if resubmit_failed_batch_items(job, "interest", batch_papers, batch_errors):
+                    continue
                 job["status"] = "interest_fallback_running"
                 job["last_error"] = f"interest batch ended with {batch_state}"
                 mark_job_updated(job)
-                updated = True
             else:
-                extracted, batch_errors = extract_interest_check(batch_job, papers)
+                batch_papers = get_job_papers(job, job.get("interest_batch_paper_ids", job.get("paper_ids")))
+                extracted, batch_errors = extract_interest_check(
+                    batch_job,
+                    batch_papers,
+                    int(job.get("interest_pack_size", 1)),
+                    job.setdefault("interest_confidence", {}),
+                )
+                cache_interest_results(
+                    job, batch_papers, extracted, model=interest_tier_model(int(job.get("interest_tier", 1)))
+                )
                 interest_results.update(extracted)
                 job["interest_results"] = interest_results
+                updated = True
+                if batch_errors and resubmit_failed_batch_items(job, "interest", batch_papers, batch_errors):
+                    continue
                 if batch_errors:
                     job["status"] = "interest_fallback_running"
                     job["last_error"] = format_item_errors("interest batch item failed", batch_errors)
                 mark_job_updated(job)
-                updated = True
 
         missing_papers = [paper for paper in papers if paper["paper_id"] not in interest_results]
+        if missing_papers and INTEREST_ENGINE == "embedding":
+            interest_results, _ = check_interest_embedding_papers(
+                missing_papers,
+                interest_results,
+                journal_writer(job, "interest_results"),
+                scores=job.setdefault("interest_scores", {}),
+            )
+            job["interest_results"] = interest_results
+            missing_papers = [paper for paper in papers if paper["paper_id"] not in interest_results]
         if missing_papers:
             interest_results, retry_errors = check_interest_sequential_papers(
-                missing_papers, interest_results
+                missing_papers,
+                interest_results,
+                journal_writer(job, "interest_results"),
+                job.setdefault("interest_confidence", {}),
             )
+            # the sequential fallback always asks INTEREST_MODEL, even after an escalation
+            cache_interest_results(job, missing_papers, interest_results, model=INTEREST_MODEL)
             job["interest_results"] = interest_results
             updated = True
             still_missing = [
@@ -830,10 +3759,11 @@ def run_stage_poll_interest_submit_summary() -> int:
                 mark_job_updated(job)
                 continue
 
-        interested_ids = [
-            paper["paper_id"] for paper in papers if interest_results.get(paper["paper_id"]) is True
-        ]
-        job["interested_paper_ids"] = interested_ids
+        if escalate_low_confidence(job, papers):
+            updated = True
+            continue
+
+        interested_ids = select_interested_ids(job, papers)
         updated = True
 
         if len(interested_ids) == 0:
@@ -845,11 +3775,18 @@ def run_stage_poll_interest_submit_summary() -> int:
 
         interested_set = set(interested_ids)
         interested_papers = [paper for paper in papers if paper["paper_id"] in interested_set]
+        cached_summaries, summary_papers = split_cached_results("summary", interested_papers, SUMMARY_MODEL)
         try:
-            summarize_job_name = submit_summary_batch(interested_papers)
-            if not summarize_job_name:
+            summarize_job_name = submit_summary_batch(summary_papers)
+            if summary_papers and not summarize_job_name:
                 raise RuntimeError("summary batch creation returned an empty job name")
+            job["summaries"] = dict(job.get("summaries", {}), **cached_summaries)
+            job["summary_batch_paper_ids"] = [paper["paper_id"] for paper in summary_papers]
             job["summarize_job_name"] = summarize_job_name
+            if summarize_job_name:
+                start_batch_clock(job, SUMMARY_MODEL, len(summary_papers))
+            else:
+                job.pop("next_poll_at", None)
             job["status"] = "summarize_submitted"
             job["last_error"] = None
             mark_job_updated(job)
@@ -865,6 +3802,7 @@ def run_stage_poll_interest_submit_summary() -> int:
         save_state(state)
     else:
         print("No interest jobs updated.")
+    write_poll_schedule(state["jobs"], "poll_interest_submit_summary")
     return 0
 
 
@@ -878,79 +3816,144 @@ def run_stage_poll_summary_send() -> int:
         print("DISCORD_BOT_TOKEN is not set.")
         return 1
 
-    state = load_state()
+    if not is_poll_stage_due("poll_summary_send"):
+        print("No summary batch is due for polling.")
+        return 0
+    state = load_state(statuses=SUMMARY_ACTIVE_STATUSES)
     updated = False
 
     for job in state["jobs"]:
-        if job.get("status") not in (
-            "summarize_submitted",
-            "summarize_running",
-            "summary_fallback_running",
-            "send_failed",
-        ):
+        if job.get("status") not in SUMMARY_ACTIVE_STATUSES:
             continue
 
         job["summaries"] = dict(job.get("summaries", {}))
         job["sent_paper_ids"] = list(job.get("sent_paper_ids", []))
         job["discord_messages"] = dict(job.get("discord_messages", {}))
 
-        if job.get("status") in ("summarize_submitted", "summarize_running"):
+        if job.get("status") in ("fused_submitted", "fused_running"):
+            is_timeout = is_older_than_hours(job.get("created_at", ""), BATCH_TIMEOUT_HOURS)
+            if not is_timeout and not is_batch_poll_due(job):
+                continue
+            batch_job = poll_batch_once(job.get("fused_job_name", ""))
+            if not batch_job:
+                continue
+
+            batch_state = batch_job.state.name
+            if batch_state not in COMPLETED_BATCH_STATUS and not is_timeout:
+                schedule_batch_poll(job)
+                if job.get("status") != "fused_running":
+                    job["status"] = "fused_running"
+                    mark_job_updated(job)
+                updated = True
+                continue
+            if batch_state in COMPLETED_BATCH_STATUS:
+                finish_batch_clock(job, batch_job)
+            else:
+                job.pop("next_poll_at", None)
+
+            papers = get_job_papers(job)
+            batch_papers = get_job_papers(job, job.get("interest_batch_paper_ids", []))
+            if batch_state == "JOB_STATE_SUCCEEDED":
+                fused_errors = apply_fused_results(job, batch_job, batch_papers)
+            else:
+                if batch_state not in COMPLETED_BATCH_STATUS:
+                    cancel_batch_safely(job.get("fused_job_name", ""))
+                fused_errors = {
+                    paper["paper_id"]: f"fused batch ended with {batch_state}" for paper in batch_papers
+                }
+            updated = True
+            if fused_errors:
+                # the regular interest -> summary path finishes the remaining papers
+                job["status"] = "interest_fallback_running"
+                job["last_error"] = format_item_errors("fused batch item failed", fused_errors)
+                mark_job_updated(job)
+                continue
+
+            if not select_interested_ids(job, papers):
+                job["status"] = "completed_no_interests"
+                job["finalized_at"] = now_iso_utc()
+                job["last_error"] = None
+                mark_job_updated(job)
+                continue
+            cached_summaries, _ = split_cached_results(
+                "summary", get_job_papers(job, job["interested_paper_ids"]), SUMMARY_MODEL
+            )
+            job["summaries"] = dict(cached_summaries, **job["summaries"])
+            job["status"] = "summarize_running"
+            job["last_error"] = None
+            mark_job_updated(job)
+
+        is_batch_pending = job.get("status") in ("summarize_submitted", "summarize_running")
+        if is_batch_pending and job.get("summarize_job_name"):
             timeout_anchor = job.get("updated_at") or job.get("created_at", "")
             is_timeout = is_older_than_hours(timeout_anchor, BATCH_TIMEOUT_HOURS)
 
+            if not is_timeout and not is_batch_poll_due(job):
+                continue
             batch_job = poll_batch_once(job.get("summarize_job_name", ""))
             if not batch_job:
                 continue
 
             batch_state = batch_job.state.name
+            if batch_state in COMPLETED_BATCH_STATUS:
+                finish_batch_clock(job, batch_job)
             if batch_state not in COMPLETED_BATCH_STATUS:
                 if is_timeout:
                     cancel_ok = cancel_batch_safely(job.get("summarize_job_name", ""))
+                    job.pop("next_poll_at", None)
                     job["status"] = "summary_fallback_running"
                     job["last_error"] = None if cancel_ok else "summary timeout reached, cancel request failed"
                     mark_job_updated(job)
-                    updated = True
-                elif job.get("status") != "summarize_running":
-                    job["status"] = "summarize_running"
-                    mark_job_updated(job)
-                    updated = True
+                else:
+                    schedule_batch_poll(job)
+                    if job.get("status") != "summarize_running":
+                        job["status"] = "summarize_running"
+                        mark_job_updated(job)
+                updated = True
                 if not is_timeout:
                     continue
 
             elif batch_state != "JOB_STATE_SUCCEEDED":
+                batch_paper_ids = job.get("summary_batch_paper_ids", job.get("interested_paper_ids", []))
+                batch_papers = get_job_papers(job, batch_paper_ids)
+                batch_errors = {
+                    paper["paper_id"]: f"summary batch ended with {batch_state}" for paper in batch_papers
+                }
+                updated = True
+                if resubmit_failed_batch_items(job, "summary", batch_papers, batch_errors):
+                    continue
                 job["status"] = "summary_fallback_running"
                 job["last_error"] = f"summary batch ended with {batch_state}"
                 mark_job_updated(job)
-                updated = True
             else:
-                interested_set = set(job.get("interested_paper_ids", []))
-                interested_papers = [
-                    paper
-                    for paper in job.get("papers", [])
-                    if paper["paper_id"] in interested_set
-                ]
-                extracted, batch_errors = extract_summaries(batch_job, interested_papers)
+                batch_paper_ids = job.get("summary_batch_paper_ids", job.get("interested_paper_ids", []))
+                batch_papers = get_job_papers(job, batch_paper_ids)
+                extracted, batch_errors = extract_summaries(batch_job, batch_papers)
+                cache_results("summary", batch_papers, extracted, SUMMARY_MODEL)
                 job["summaries"].update(extracted)
+                updated = True
+                if batch_errors and resubmit_failed_batch_items(job, "summary", batch_papers, batch_errors):
+                    continue
                 if batch_errors:
                     job["status"] = "summary_fallback_running"
                     job["last_error"] = format_item_errors("summary batch item failed", batch_errors)
                 mark_job_updated(job)
-                updated = True
 
         interested_ids = job.get("interested_paper_ids", [])
-        papers_by_id = {paper["paper_id"]: paper for paper in job.get("papers", [])}
+        paper_store = get_paper_store()
         missing_ids = [paper_id for paper_id in interested_ids if paper_id not in job["summaries"]]
         if missing_ids:
             job["status"] = "summary_fallback_running"
             retry_errors = {
                 paper_id: "paper metadata is missing"
                 for paper_id in missing_ids
-                if paper_id not in papers_by_id
+                if paper_store.get(paper_id) is None
             }
-            missing_papers = [papers_by_id[paper_id] for paper_id in missing_ids if paper_id in papers_by_id]
+            missing_papers = get_job_papers(job, missing_ids)
             summaries, generated_errors = summarize_sequential_papers(
-                missing_papers, job["summaries"]
+                missing_papers, job["summaries"], journal_writer(job, "summaries")
             )
+            cache_results("summary", missing_papers, summaries, SUMMARY_MODEL)
             retry_errors.update(generated_errors)
             job["summaries"] = summaries
             updated = True
@@ -1001,43 +4004,63 @@ def run_stage_poll_summary_send() -> int:
                 continue
 
         all_success = True
-        for paper_id in pending_ids:
-            paper = papers_by_id.get(paper_id)
-            summary = job["summaries"].get(paper_id)
-            if paper is None or summary is None:
-                all_success = False
-                continue
-
-            message_state = job["discord_messages"].get(paper_id)
-            if not message_state:
-                message = post_summary_to_discord(discord_webhook_url, paper, summary)
-                if message:
-                    message_state = {
-                        "message_id": message["id"],
-                        "channel_id": message["channel_id"],
-                        "reaction_added": False,
-                        "read_requested": False,
-                        "reading_memo_sent": False,
-                        "paper_thread_id": None,
-                    }
-                    job["discord_messages"][paper_id] = message_state
-                    updated = True
+        if DISCORD_SEND_MODE == "digest":
+            digest_items = [
+                (paper_store.get(paper_id), job["summaries"][paper_id])
+                for paper_id in pending_ids
+                if paper_id not in job["discord_messages"]
+                and paper_id in job["summaries"]
+                and paper_store.get(paper_id) is not None
+            ]
+            if digest_items:
+                all_success = post_summary_digests(discord_webhook_url, job, digest_items)
+                updated = True
+        # webhook posts stay in order on this thread; reactions go to their own bucket in parallel
+        reactions = {}
+        with ThreadPoolExecutor(max_workers=DISCORD_CONCURRENCY) as executor:
+            for paper_id in pending_ids:
+                paper = paper_store.get(paper_id)
+                summary = job["summaries"].get(paper_id)
+                if paper is None or summary is None:
+                    all_success = False
+                    continue
 
-            if message_state and (
-                message_state.get("reaction_added")
-                or add_read_reaction(
-                    discord_bot_token,
-                    message_state["channel_id"],
-                    message_state["message_id"],
-                )
-            ):
-                message_state["reaction_added"] = True
-                if paper_id not in job["sent_paper_ids"]:
-                    job["sent_paper_ids"].append(paper_id)
-                    updated = True
-            else:
+                message_state = job["discord_messages"].get(paper_id)
+                if not message_state and DISCORD_SEND_MODE != "digest":
+                    message = post_summary_to_discord(discord_webhook_url, paper, summary)
+                    if message:
+                        message_state = {
+                            "message_id": message["id"],
+                            "channel_id": message["channel_id"],
+                            "reaction_added": False,
+                            "read_requested": False,
+                            "reading_memo_sent": False,
+                            "paper_thread_id": None,
+                        }
+                        job["discord_messages"][paper_id] = message_state
+                        append_state_journal(job["pipeline_id"], "discord_messages", paper_id, message_state)
+                        updated = True
+
+                if not message_state:
+                    all_success = False
+                elif message_state.get("reaction_added"):
+                    reactions[paper_id] = None
+                else:
+                    reactions[paper_id] = executor.submit(
+                        add_read_reaction,
+                        discord_bot_token,
+                        message_state["channel_id"],
+                        message_state["message_id"],
+                    )
+
+        for paper_id, reaction in reactions.items():
+            if reaction is not None and not reaction.result():
                 all_success = False
-            time.sleep(1.5)
+                continue
+            job["discord_messages"][paper_id]["reaction_added"] = True
+            if paper_id not in job["sent_paper_ids"]:
+                job["sent_paper_ids"].append(paper_id)
+                updated = True
 
         if all_success and len(job["sent_paper_ids"]) == len(interested_ids):
             job["status"] = "completed"
@@ -1056,6 +4079,7 @@ def run_stage_poll_summary_send() -> int:
         save_state(state)
     else:
         print("No summary jobs updated.")
+    write_poll_schedule(state["jobs"], "poll_summary_send")
     return 0
 
 
@@ -1070,34 +4094,54 @@ def run_stage_poll_reading_requests() -> int:
         print("DISCORD_FORUM_CHANNEL_ID is not set.")
         return 1
 
-    state = load_state()
+    state = load_state(open_messages_only=True)
+    candidates = find_read_request_candidates(
+        discord_bot_token,
+        [
+            message_state
+            for job in state["jobs"]
+            for message_state in job.get("discord_messages", {}).values()
+            if not message_state.get("reading_memo_sent")
+            and not message_state.get("read_requested")
+            and is_reaction_check_due(message_state)
+        ],
+    )
     updated = False
     for job in state["jobs"]:
         messages = job.get("discord_messages", {})
         if not messages:
             continue
 
-        papers_by_id = {paper["paper_id"]: paper for paper in job.get("papers", [])}
+        paper_store = get_paper_store()
         job["reading_memos"] = dict(job.get("reading_memos", {}))
         for paper_id, message_state in messages.items():
             if message_state.get("reading_memo_sent"):
                 continue
 
             if not message_state.get("read_requested"):
-                requested = has_read_request(
+                if not is_reaction_check_due(message_state):
+                    continue
+                emoji = read_request_emoji(message_state)
+                requested = (message_state["message_id"], emoji) in candidates and has_read_request(
                     discord_bot_token,
                     message_state["channel_id"],
                     message_state["message_id"],
                     discord_user_id,
+                    emoji,
                 )
                 if not requested:
+                    message_state["next_check_at"] = next_reaction_check_at(message_state)
+                    updated = True
                     continue
                 message_state["read_requested"] = True
                 message_state["read_requested_at"] = now_iso_utc()
                 message_state["reading_last_error"] = None
                 updated = True
+                requested_paper = paper_store.get(paper_id)
+                if requested_paper is not None:
+                    learn_interest_feedback([requested_paper], 1)
 
-            paper = papers_by_id.get(paper_id)
+            paper = paper_store.get(paper_id)
             if paper is None:
                 message_state["reading_last_error"] = "paper metadata is missing"
                 updated = True
@@ -1106,6 +4150,9 @@ def run_stage_poll_reading_requests() -> int:
             if paper_id not in job["reading_memos"]:
                 try:
                     job["reading_memos"][paper_id] = generate_reading_memo(paper)
+                    append_state_journal(
+                        job["pipeline_id"], "reading_memos", paper_id, job["reading_memos"][paper_id]
+                    )
                     message_state["reading_last_error"] = None
                     updated = True
                 except Exception as exc:
@@ -1128,6 +4175,7 @@ def run_stage_poll_reading_requests() -> int:
                 message_state["paper_thread_id"] = forum_post["id"]
                 message_state["reading_memo_sent_at"] = now_iso_utc()
                 message_state["reading_last_error"] = None
+                append_state_journal(job["pipeline_id"], "discord_messages", paper_id, message_state)
                 print(f"Created Forum post for {paper_id}: {forum_post['id']}")
             else:
                 message_state["reading_retry_count"] = int(
@@ -1163,38 +4211,282 @@ def run_self_check() -> int:
     )
     assert discord_embed_text_length(embed) <= DISCORD_EMBED_TOTAL_LIMIT
     assert all(len(field["value"]) <= DISCORD_EMBED_FIELD_VALUE_LIMIT for field in embed["fields"])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = SqliteStateBackend(os.path.join(tmp_dir, "state.sqlite3"))
+        state = backend.load(statuses=())
+        state["jobs"] = [
+            {
+                "pipeline_id": "a",
+                "status": "completed",
+                "papers": [{"paper_id": "p"}],
+                "discord_messages": {},
+            },
+            {
+                "pipeline_id": "b",
+                "status": "interest_submitted",
+                "papers": [],
+                "discord_messages": {"p": {"message_id": "1", "reading_memo_sent": False}},
+            },
+            {
+                "pipeline_id": "c",
+                "status": "completed",
+                "papers": [],
+                "discord_messages": {"p": {"message_id": "2", "next_check_at": READING_CHECK_NEVER}},
+            },
+        ]
+        backend.save(state)
+        active_jobs = backend.load(statuses=INTEREST_ACTIVE_STATUSES)["jobs"]
+        assert [job["pipeline_id"] for job in active_jobs] == ["b"]
+        assert [job["pipeline_id"] for job in backend.load(open_messages_only=True)["jobs"]] == ["b"]
+        state = backend.load()
+        assert state["jobs"][0]["papers"] == [{"paper_id": "p"}]
+        state["jobs"] = state["jobs"][:1]
+        backend.save(state)
+        assert [job["pipeline_id"] for job in backend.load()["jobs"]] == ["a"]
+        backend.connection.close()
+
+    baseline_state = {"schema_version": 1, "jobs": [{"pipeline_id": "a", "status": "x", "papers": [1]}]}
+    baseline = state_fingerprint(baseline_state)
+    changed_state = {
+        "schema_version": 1,
+        "jobs": [{"pipeline_id": "b", "status": "new"}, {"pipeline_id": "a", "status": "y", "papers": [1]}],
+    }
+    delta = build_state_delta(baseline, changed_state)
+    assert delta["jobs"]["a"] == {"set": {"status": "y"}}
+    apply_state_delta(baseline_state, json.loads(dump_compact_json(delta)))
+    assert sorted(job["pipeline_id"] for job in baseline_state["jobs"]) == ["a", "b"]
+    assert build_state_delta(state_fingerprint(baseline_state), baseline_state) == {}
+
+    now = datetime.datetime.now(ZoneInfo("UTC"))
+    finished_job = {
+        "pipeline_id": "c",
+        "status": "completed",
+        "paper_ids": ["open", "done"],
+        "discord_messages": {"open": {"reading_memo_sent": False}, "done": {"reading_memo_sent": True}},
+        "reading_memos": {"done": {}},
+        "finalized_at": now.isoformat(),
+    }
+    compacted = compact_finalized_job(finished_job, now)
+    assert compacted is not None and compacted["paper_ids"] == ["open"]
+    assert compacted["reading_memos"] == {}
+    expired = now + datetime.timedelta(days=READING_REQUEST_WINDOW_DAYS)
+    assert compact_finalized_job(finished_job, expired) is None
+    cache = ResultCache(os.path.join(tempfile.gettempdir(), "unused-result-cache.json"))
+    cache.entries = {}
+    paper = {"paper_id": "http://arxiv.org/abs/2608.12345v2", "title": "t", "summary": "s"}
+    cache.put("interest", paper, "model", True)
+    assert cache.get("interest", dict(paper, paper_id="2608.12345v3"), "model")["value"] is True
+    assert cache.get("interest", dict(paper, summary="changed"), "model") is None
+    assert cache.get("interest", paper, "other-model") is None
+    cache.dirty = False
+    assert cache.get("interest", paper, "model") is not None and not cache.dirty
+    cache.put("fused_interest", paper, SUMMARY_MODEL, False)
+    assert cache.get("interest", paper, SUMMARY_MODEL) is None
+    assert cache.key("fused_interest", paper, SUMMARY_MODEL) != cache.key("interest", paper, SUMMARY_MODEL)
+    assert ("fused_interest", SUMMARY_MODEL) in result_cache_lookups("interest", INTEREST_MODEL)
+    now = datetime.datetime(2026, 8, 20, 12, 0, tzinfo=ARXIV_TIMEZONE)
+    first_run = harvest_windows(None, now)
+    assert len(first_run) == 1 and first_run[0][1] - first_run[0][0] == datetime.timedelta(days=1)
+    backlog = harvest_windows(first_run[0][0] - datetime.timedelta(days=30), now)
+    assert len(backlog) == HARVEST_MAX_WINDOWS and backlog[0][1] == backlog[1][0]
+    assert harvest_windows(first_run[0][1], now) == []
+    backfill_windows = date_range_windows(datetime.date(2026, 3, 7), datetime.date(2026, 3, 9))
+    assert len(backfill_windows) == 3 and backfill_windows[-1][1].date() == datetime.date(2026, 3, 10)
+    assert paper_store_key("http://arxiv.org/abs/2608.12345v2") == "2608.12345v2"
+    assert split_arxiv_id("http://arxiv.org/abs/math/0501001v1") == ("math/0501001", "v1")
+    assert paper_store_shard("2608.12345v2") == "2608.12"
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0 and 0.5 < bucket.reserve(1) <= 1.0
+    assert is_retryable_gemini_error(genai_errors.ServerError(503, {}))
+    assert not is_retryable_gemini_error(genai_errors.ClientError(400, {}))
+    assert is_retryable_gemini_error(httpx.ReadTimeout("timed out"))
+    assert is_retryable_gemini_error(httpx.ConnectError("refused"))
+    answered_part = {"text": '{"interested_in": true, "confidence": 0.9}'}
+    answered = {"candidates": [{"content": {"role": "model", "parts": [answered_part]}}]}
+    result_lines = [
+        json.dumps({"key": "c", "error": "quota"}).encode(),
+        b"",
+        json.dumps({"key": "b", "response": answered}).encode(),
+    ]
+    parsed_lines = list(parse_batch_result_lines(result_lines))
+    assert [key for key, _, _ in parsed_lines] == ["c", "b"] and parsed_lines[0][2] == "quota"
+    assert parse_interest_check(parsed_lines[1][1].text) == (True, 0.9)
+    assert parse_interest_check('{"interested_in": false}') == (False, 1.0)
+    inline_batch = genai_types.BatchJob(dest=genai_types.BatchJobDestination(inlined_responses=[
+        genai_types.InlinedResponse(error=genai_types.JobError(message="quota")),
+        genai_types.InlinedResponse(response=genai_types.GenerateContentResponse.model_validate(answered)),
+        genai_types.InlinedResponse(),
+    ]))
+    batch_papers = [{"paper_id": "a"}, {"paper_id": "b"}, {"paper_id": "c"}]
+    confidences: Dict[str, float] = {}
+    results, item_errors = extract_interest_check(inline_batch, batch_papers, confidences=confidences)
+    assert confidences == {"b": 0.9}
+    assert results == {"b": True} and item_errors == {"a": "quota", "c": "missing batch response"}
+    short_batch = genai_types.BatchJob(dest=genai_types.BatchJobDestination(inlined_responses=[]))
+    short_errors = extract_interest_check(short_batch, batch_papers)[1]
+    assert short_errors == dict.fromkeys("abc", "missing batch response")
+    request_line = json.loads(summary_request_template.file_line([paper]))
+    assert request_line["key"] == paper["paper_id"]
+    assert request_line["request"]["generation_config"]["thinking_config"] == {"thinking_level": "low"}
+    packed_template = interest_request_template(3)
+    pack = [dict(paper, paper_id=f"http://arxiv.org/abs/2608.0000{i}v1") for i in range(3)]
+    packed_answer = json.dumps({"results": [
+        {"paper_id": "2608.00000v1", "interested_in": True, "confidence": 0.9},
+        {"paper_id": "2608.00001", "interested_in": False, "confidence": 0.9},
+        {"paper_id": "2608.00001", "interested_in": True, "confidence": 0.4},
+    ]})
+    packed_results, packed_errors = packed_template.parse_unit(packed_answer, pack)
+    assert packed_results == {pack[0]["paper_id"]: (True, 0.9)}
+    assert set(packed_errors) == {pack[1]["paper_id"], pack[2]["paper_id"]}
+    assert "system_instruction" in request_line["request"]
+    assert prompt_summarize not in request_line["request"]["contents"][0]["parts"][0]["text"]
+    assert "symbolic dynamics" in text_terms("On Symbolic Dynamics")
+    prefilter = InterestPrefilter(["symbolic dynamics"], [])
+    prefilter_papers = [
+        {"paper_id": "on-topic", "title": "Entropy in symbolic dynamics", "summary": "Subshifts."},
+        {"paper_id": "off-topic", "title": "Protein folding", "summary": "Neural networks for proteins."},
+    ]
+    prefilter_decisions = prefilter.score(prefilter_papers)
+    assert prefilter_decisions["on-topic"][1] == "llm" and prefilter_decisions["off-topic"][1] == "reject"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        embedding_index = EmbeddingIndex(os.path.join(tmp_dir, "embedding_index.npz"))
+        embedding_index.ids = ["liked", "ignored"]
+        embedding_index.vectors = np.eye(2, EMBEDDING_DIMENSIONS, dtype=np.float32)
+        embedding_index.labels = np.array([1, 0], dtype=np.int8)
+        embedding_index.needs_fold = embedding_index.dirty = True
+        embedding_index.save()
+        embedding_index.add([("ignored", "")], 1)
+        assert embedding_index.labels.tolist() == [1, 1] and embedding_index.dirty
+        snapshot_mtime = os.path.getmtime(embedding_index.path)
+        embedding_index.save()
+        assert os.path.getmtime(embedding_index.path) == snapshot_mtime
+        assert os.path.exists(embedding_index.delta_path)
+        reloaded_index = EmbeddingIndex(embedding_index.path)
+        reloaded_index.load()
+        assert reloaded_index.ids == ["liked", "ignored"] and reloaded_index.labels.tolist() == [1, 1]
+        assert reloaded_index.changed_ids == {"ignored"}
+    fused_summary = json.dumps({"title": "t", "summary": "s", "keywords": ["k"]})
+    fused_rejected = parse_fused_check('{"interested_in": false, "confidence": 0.8, "summary": null}')
+    assert fused_rejected == (False, 0.8, None)
+    fused_verdict = parse_fused_check(
+        f'{{"interested_in": true, "confidence": 0.9, "summary": {fused_summary}}}'
+    )
+    assert fused_verdict[:2] == (True, 0.9) and fused_verdict[2] is not None
+    reaction_route = discord_route("PUT", f"{DISCORD_API_BASE_URL}/channels/1/messages/2/reactions/x/@me")
+    assert reaction_route == ("PUT /api/v10/channels/1/messages/:id/reactions/:emoji/@me", "1")
+    assert discord_route("POST", "https://discord.com/api/webhooks/9/token")[1] == "9/token"
+    rate_limiter = DiscordRateLimiter()
+    rate_limiter.acquire(*reaction_route)
+    rate_limit_headers = {
+        "X-RateLimit-Bucket": "b",
+        "X-RateLimit-Limit": "1",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "0.05",
+    }
+    rate_limiter.update(*reaction_route, types.SimpleNamespace(status_code=204, headers=rate_limit_headers))
+    rate_limit_started = time.monotonic()
+    rate_limiter.acquire(*reaction_route)
+    assert time.monotonic() - rate_limit_started >= 0.04
+    rate_limit_started = time.monotonic()
+    rate_limiter.acquire(*reaction_route)
+    assert time.monotonic() - rate_limit_started >= 0.04
+    # a 429 on a route without a known bucket is not waited out by the limiter
+    unknown_route_429 = requests.Response()
+    unknown_route_429.status_code = 429
+    unknown_route_429._content = b'{"retry_after": 1.5}'
+    unknown_route_429.request = requests.Request("POST", "https://discord.com/api/webhooks/8/token").prepare()
+    assert discord_retry_delay(unknown_route_429, 1) == 1.5
+    unknown_route_429._content = b""
+    assert discord_retry_delay(unknown_route_429, 2) == DISCORD_RETRY_BACKOFF_SECONDS * 2
+    digest_paper = {"paper_id": "2601.00001v1", "title": "t", "authors": ["a"], "entry_id": "https://x"}
+    digest_summary = {"title": "t", "summary": "s", "keywords": ["k"], "appendix": None}
+    digests = group_summary_digests([(digest_paper, digest_summary)] * 12)
+    assert [len(group) for group in digests] == [10, 2]
+    assert digests[1][1][1]["title"].startswith(KEYCAP_EMOJIS[1])
+    assert read_request_emoji({"slot": 10}) == "🔟" and read_request_emoji({}) == READ_EMOJI
+    def snowflake(age: datetime.timedelta) -> str:
+        posted_at = datetime.datetime.now(ZoneInfo("UTC")) - age
+        return str((int(posted_at.timestamp() * 1000) - DISCORD_EPOCH_MS) << 22)
+
+    week_old_check = next_reaction_check_at({"message_id": snowflake(datetime.timedelta(days=3))})
+    week_old_wait = parse_iso_datetime(week_old_check) - datetime.datetime.now(ZoneInfo("UTC"))
+    assert week_old_wait > datetime.timedelta(minutes=59)
+    year_old_check = next_reaction_check_at({"message_id": snowflake(datetime.timedelta(days=400))})
+    assert year_old_check == READING_CHECK_NEVER
+    assert is_reaction_check_due({}) and not is_reaction_check_due({"next_check_at": READING_CHECK_NEVER})
+    older_message = {"channel_id": "c", "message_id": snowflake(datetime.timedelta(days=3))}
+    newer_message = {"channel_id": "c", "message_id": snowflake(datetime.timedelta(hours=1))}
+    assert group_wanted_reactions([newer_message])["c"][0] == int(newer_message["message_id"]) - 1
+    # the older message becomes due on a later run and is still scanned
+    older_due = group_wanted_reactions([older_message])["c"]
+    assert older_due[0] == int(older_message["message_id"]) - 1
+    assert older_message["message_id"] in older_due[1]
+    _batch_durations[:] = [{"model": "m", "items": 50, "seconds": 4 * 3600}]
+    assert predict_batch_seconds("m", 150) == 8 * 3600 and predict_batch_seconds("other", 10) is None
+    poll_job = {"batch_submitted_at": now_iso_utc(), "batch_model": "m", "batch_items": 50}
+    schedule_batch_poll(poll_job)
+    poll_wait = parse_iso_datetime(poll_job["next_poll_at"]) - datetime.datetime.now(ZoneInfo("UTC"))
+    assert datetime.timedelta(hours=1.9) < poll_wait <= datetime.timedelta(hours=2)
+    assert not is_batch_poll_due(poll_job) and is_batch_poll_due({})
+    _batch_durations.clear()
     print("Self-check passed.")
     return 0
 
 
+def run_stage(args: argparse.Namespace) -> int:
+    if args.stage == "enqueue_interest":
+        return run_stage_enqueue_interest()
+    if args.stage == "backfill":
+        return run_stage_backfill(args.from_date, args.to_date)
+    if args.stage == "poll_interest_submit_summary":
+        return run_stage_poll_interest_submit_summary()
+    if args.stage == "poll_summary_send":
+        return run_stage_poll_summary_send()
+    if args.stage == "poll_reading_requests":
+        return run_stage_poll_reading_requests()
+    if args.stage == "compact_state":
+        return run_stage_compact_state()
+    if args.stage == "export_state":
+        return export_state_json(args.state_json)
+    if args.stage == "import_state":
+        return import_state_json(args.state_json)
+    if args.stage == "self_check":
+        return run_self_check()
+
+    return 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="arXiv summarizer pipeline")
     parser.add_argument(
         "--stage",
         choices=[
             "enqueue_interest",
+            "backfill",
             "poll_interest_submit_summary",
             "poll_summary_send",
             "poll_reading_requests",
+            "compact_state",
+            "export_state",
+            "import_state",
             "self_check",
         ],
         default=os.getenv("PIPELINE_STAGE", "enqueue_interest"),
         help="Pipeline stage to execute",
     )
+    parser.add_argument("--from", dest="from_date", help="First day (YYYY-MM-DD) for backfill")
+    parser.add_argument("--to", dest="to_date", help="Last day (YYYY-MM-DD) for backfill")
+    parser.add_argument(
+        "--state-json",
+        default=STATE_FILE_PATH,
+        help="JSON file used by export_state/import_state",
+    )
     args = parser.parse_args()
-
-    if args.stage == "enqueue_interest":
-        return run_stage_enqueue_interest()
-    if args.stage == "poll_interest_submit_summary":
-        return run_stage_poll_interest_submit_summary()
-    if args.stage == "poll_summary_send":
-        return run_stage_poll_summary_send()
-    if args.stage == "poll_reading_requests":
-        return run_stage_poll_reading_requests()
-    if args.stage == "self_check":
-        return run_self_check()
-
-    return 1
+    try:
+        return run_stage(args)
+    finally:
+        log_http_stats()
 
 
 if __name__ == "__main__":